@@ -0,0 +1,126 @@
+import asyncio
+import time
+from typing import Any, Dict, Tuple, Type
+
+from app.core.logger import logger
+
+
+class CircuitBreakerOpen(Exception):
+    def __init__(self, name: str):
+        super().__init__(f"Circuit breaker {name} is open")
+        self.name = name
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        recovery_timeout: float,
+        half_open_max_calls: int = 1,
+        expected_exceptions: Tuple[Type[BaseException], ...] = (
+            OSError,
+            asyncio.TimeoutError,
+        ),
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.expected_exceptions = expected_exceptions
+
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+
+        self.successes = 0
+        self.failures = 0
+        self.rejected = 0
+        self.opened = 0
+
+    @property
+    def state(self) -> str:
+        if (
+            self._state == self.OPEN
+            and time.monotonic() - self._opened_at >= self.recovery_timeout
+        ):
+            self._state = self.HALF_OPEN
+            self._probes = 0
+
+        return self._state
+
+    def trip(self) -> None:
+        if self._state != self.OPEN:
+            logger.warning(f"Circuit breaker {self.name} opened")
+            self.opened += 1
+
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+
+    def reset(self) -> None:
+        if self._state != self.CLOSED:
+            logger.info(f"Circuit breaker {self.name} closed")
+
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+
+    def allow(self) -> bool:
+        state = self.state
+
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and self._probes < self.half_open_max_calls:
+            self._probes += 1
+            return True
+
+        return False
+
+    def record_success(self) -> None:
+        self.successes += 1
+
+        if self._state == self.HALF_OPEN:
+            self.reset()
+        else:
+            self._consecutive_failures = 0
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._consecutive_failures += 1
+
+        if (
+            self._state == self.HALF_OPEN
+            or self._consecutive_failures >= self.failure_threshold
+        ):
+            self.trip()
+
+    async def __aenter__(self) -> "CircuitBreaker":
+        if not self.allow():
+            self.rejected += 1
+            raise CircuitBreakerOpen(self.name)
+
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        if exc_type is None:
+            self.record_success()
+        elif issubclass(exc_type, self.expected_exceptions):
+            self.record_failure()
+        elif self._state == self.HALF_OPEN:
+            self._probes -= 1
+
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutiveFailures": self._consecutive_failures,
+            "successes": self.successes,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "opened": self.opened,
+        }
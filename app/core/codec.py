@@ -0,0 +1,127 @@
+import pickle
+import zlib
+from dataclasses import fields, is_dataclass
+from datetime import date, datetime
+from enum import Enum
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Optional,
+    Union,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
+
+import orjson
+
+RAW = b"\x00"
+ZLIB = b"\x01"
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+@lru_cache(maxsize=None)
+def _decoder(type_: Any) -> Callable[[Any], Any]:
+    if type_ is None or type_ is Any:
+        return _identity
+
+    origin = get_origin(type_)
+    if origin is Union:
+        args = [arg for arg in get_args(type_) if arg is not type(None)]
+        return _decoder(args[0]) if len(args) == 1 else _identity
+    if origin is list:
+        (item_type,) = get_args(type_) or (None,)
+        decode_item = _decoder(item_type)
+        return lambda value: [decode_item(item) for item in value]
+    if origin is dict:
+        _, item_type = get_args(type_) or (None, None)
+        decode_item = _decoder(item_type)
+        return lambda value: {key: decode_item(item) for key, item in value.items()}
+
+    if is_dataclass(type_):
+        hints = get_type_hints(type_)
+        field_decoders = [
+            (field.name, _decoder(hints[field.name])) for field in fields(type_)
+        ]
+
+        def decode_dataclass(value: Dict[str, Any]) -> Any:
+            return type_(
+                **{
+                    name: None if value[name] is None else decode(value[name])
+                    for name, decode in field_decoders
+                    if name in value
+                }
+            )
+
+        return decode_dataclass
+    if type_ is datetime:
+        return datetime.fromisoformat
+    if type_ is date:
+        return date.fromisoformat
+    if isinstance(type_, type) and issubclass(type_, Enum):
+        return type_
+
+    return _identity
+
+
+def from_primitive(type_: Any, value: Any) -> Any:
+    if value is None:
+        return None
+
+    return _decoder(type_)(value)
+
+
+class PickleCodec:
+    name = "pickle"
+
+    def dumps(self, value: object) -> bytes:
+        return pickle.dumps(value)
+
+    def loads(self, data: bytes, type_: Optional[type] = None) -> object:
+        return pickle.loads(data)
+
+
+class JSONCodec:
+    name = "json"
+
+    def dumps(self, value: object) -> bytes:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+    def loads(self, data: bytes, type_: Optional[type] = None) -> object:
+        return from_primitive(type_, orjson.loads(data))
+
+
+CODECS = {codec.name: codec for codec in (PickleCodec(), JSONCodec())}
+
+
+class CompressedCodec:
+    def __init__(self, codec, threshold: int, level: int = 1):
+        self.codec = codec
+        self.name = codec.name
+        self.threshold = threshold
+        self.level = level
+
+    def dumps(self, value: object) -> bytes:
+        data = self.codec.dumps(value)
+
+        if self.threshold and len(data) >= self.threshold:
+            return ZLIB + zlib.compress(data, self.level)
+
+        return RAW + data
+
+    def loads(self, data: bytes, type_: Optional[type] = None) -> object:
+        header, payload = data[:1], data[1:]
+
+        if header == ZLIB:
+            payload = zlib.decompress(payload)
+
+        return self.codec.loads(payload, type_)
+
+
+def get_codec(name: str, compression_threshold: int) -> CompressedCodec:
+    return CompressedCodec(CODECS[name], threshold=compression_threshold)
@@ -0,0 +1,52 @@
+import time
+from typing import Any, Dict
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
+
+from app.core.metrics import Histogram
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_ms = Histogram()
+        self.connect_ms = Histogram()
+        self.timeouts = 0
+        self.connect_errors = 0
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.wait_ms.observe((time.perf_counter() - started) * 1000)
+
+    def _create_connection(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+
+        try:
+            connection = super()._create_connection()
+        except Exception:
+            self.connect_errors += 1
+            raise
+
+        self.connect_ms.observe((time.perf_counter() - started) * 1000)
+        return connection
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": self.size(),
+            "checkedIn": self.checkedin(),
+            "checkedOut": self.checkedout(),
+            "overflow": max(self.overflow(), 0),
+            "maxOverflow": self._max_overflow,
+            "timeouts": self.timeouts,
+            "connectErrors": self.connect_errors,
+            "waitMs": self.wait_ms.snapshot(),
+            "connectMs": self.connect_ms.snapshot(),
+        }
@@ -0,0 +1,101 @@
+from typing import Optional, Tuple
+
+import orjson
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    and_,
+    func,
+    literal,
+    literal_column,
+    or_,
+    select,
+)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def estimate_rows(session: AsyncSession, stmt: Select) -> int:
+    # Values stay bound parameters of the connection's own dialect: inlined
+    # into text(), a ":name" inside a value would be read as a parameter and
+    # "%" would be escaped for a different paramstyle than the real count.
+    conn = await session.connection()
+    compiled = stmt.compile(dialect=conn.dialect)
+    params = compiled.construct_params()
+    if compiled.positiontup is not None:
+        params = tuple(params[name] for name in compiled.positiontup)
+
+    plan = (
+        await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", params)
+    ).scalar()
+
+    if isinstance(plan, (str, bytes)):
+        plan = orjson.loads(plan)
+
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def count_rows(
+    session: AsyncSession, stmt: Select, estimate_threshold: int = 0
+) -> Tuple[int, bool]:
+    if estimate_threshold:
+        estimate = await estimate_rows(session, stmt)
+        if estimate >= estimate_threshold:
+            return estimate, True
+
+    total = (
+        await session.execute(select(func.count()).select_from(stmt.subquery()))
+    ).scalar()
+
+    return total, False
+
+
+def prefix_upper_bound(prefix: str) -> Optional[str]:
+    while prefix:
+        code = ord(prefix[-1]) + 1
+        if 0xD800 <= code <= 0xDFFF:
+            code = 0xE000
+        if code <= 0x10FFFF:
+            return prefix[:-1] + chr(code)
+
+        prefix = prefix[:-1]
+
+    return None
+
+
+def starts_with(column: ColumnElement, prefix: str) -> ColumnElement:
+    clauses = [column.startswith(prefix, autoescape=True), column.op("~>=~")(prefix)]
+
+    upper_bound = prefix_upper_bound(prefix)
+    if upper_bound is not None:
+        clauses.append(column.op("~<~")(upper_bound))
+
+    return and_(*clauses)
+
+
+SEARCH_CONFIG = "simple"
+TRIGRAM_MIN_LENGTH = 3
+
+
+def search_vector(column: ColumnElement) -> ColumnElement:
+    # The config is inlined so the expression matches the expression index.
+    return func.to_tsvector(literal_column(f"'{SEARCH_CONFIG}'::regconfig"), column)
+
+
+def text_search(column: ColumnElement, q: str) -> Tuple[ColumnElement, ColumnElement]:
+    vector = search_vector(column)
+    ts_query = func.websearch_to_tsquery(
+        literal(SEARCH_CONFIG, postgresql.REGCONFIG), q
+    )
+    match = vector.op("@@")(ts_query)
+    rank = func.ts_rank_cd(vector, ts_query, type_=postgresql.REAL)
+
+    # Trigrams match partial words the text search config would not stem to;
+    # below three characters no trigram index can serve the query.
+    if len(q) >= TRIGRAM_MIN_LENGTH:
+        match = or_(match, column.op("%>")(q))
+        rank = func.greatest(
+            rank, func.word_similarity(q, column, type_=postgresql.REAL)
+        )
+
+    return match, rank
@@ -1,40 +1,224 @@
-from sqlalchemy import text
+import itertools
+import math
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional
+from uuid import uuid4
+
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_scoped_session,
     async_sessionmaker,
     create_async_engine,
 )
-from sqlalchemy.orm import DeclarativeBase
-from starlette_context import context
+from sqlalchemy.engine import Connection, ExceptionContext
+from sqlalchemy.orm import DeclarativeBase, Session, SessionTransaction
+
+from app.core.config import config
+from app.core.db.pool import InstrumentedPool
+from app.core.deadline import remaining, request_deadline
+from app.core.errors import error
+from app.core.query_budget import count_statement
+from app.core.timing import DB, record
+
+
+@dataclass
+class SessionScope:
+    session_id: str
+    primary_until: float = 0.0
+
+
+session_scope: ContextVar[Optional[SessionScope]] = ContextVar(
+    "session_scope", default=None
+)
 
-from app.core.config import config, is_local
 
+def get_session_id() -> Optional[str]:
+    scope = session_scope.get()
+    return scope.session_id if scope else None
 
-def get_session_id():
-    return context.get("session_id")
+
+def pin_primary() -> None:
+    scope = session_scope.get()
+    if scope:
+        scope.primary_until = time.time() + config.DB_READ_YOUR_WRITES_WINDOW
+
+
+def is_primary_pinned() -> bool:
+    scope = session_scope.get()
+    return scope is not None and scope.primary_until > time.time()
+
+
+QUERY_CANCELED = "57014"
 
 
 class Base(DeclarativeBase): ...
 
 
-engine = create_async_engine(
-    config.DB_URL, pool_size=20, echo=is_local(), pool_pre_ping=True, max_overflow=10
+class WriterSession(Session): ...
+
+
+@event.listens_for(WriterSession, "after_commit")
+def on_writer_commit(session: Session):
+    pin_primary()
+
+
+@event.listens_for(Session, "after_begin")
+def on_begin(session: Session, transaction: SessionTransaction, connection: Connection):
+    timeout = remaining()
+    if timeout is not None:
+        connection.info["internal"] = True
+        try:
+            connection.exec_driver_sql(
+                f"SET LOCAL statement_timeout = {math.ceil(timeout * 1000)}"
+            )
+        finally:
+            connection.info.pop("internal", None)
+
+
+def on_engine_error(context: ExceptionContext):
+    sqlstate = getattr(context.original_exception, "sqlstate", None)
+    if sqlstate == QUERY_CANCELED and request_deadline.get() is not None:
+        return error.DeadlineExceeded()
+
+
+def on_before_cursor_execute(conn: Connection, cursor, statement: str, *args):
+    # Statements issued by the session itself (on_begin) are not the
+    # application's and stay out of query budgets and Server-Timing.
+    if conn.info.get("internal"):
+        return
+
+    count_statement(statement)
+    conn.info["query_started"] = time.perf_counter()
+
+
+def on_after_cursor_execute(conn: Connection, *args):
+    started = conn.info.pop("query_started", None)
+    if started is not None:
+        record(DB, (time.perf_counter() - started) * 1000)
+
+
+class ReaderBalancer:
+    ROUND_ROBIN = "round_robin"
+    LEAST_CONNECTIONS = "least_connections"
+
+    def __init__(self, engines: List[AsyncEngine], strategy: str = ROUND_ROBIN):
+        if strategy not in (self.ROUND_ROBIN, self.LEAST_CONNECTIONS):
+            raise ValueError(f"Unknown reader balancer: {strategy}")
+
+        self.engines = engines
+        self.strategy = strategy
+        self._cycle = itertools.cycle(engines)
+
+    def choose(self) -> AsyncEngine:
+        if self.strategy == self.LEAST_CONNECTIONS:
+            return min(self.engines, key=lambda engine: engine.pool.checkedout())
+
+        return next(self._cycle)
+
+
+class ReaderSession(Session):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._reader: Optional[AsyncEngine] = None
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if is_primary_pinned():
+            return engine.sync_engine
+
+        if self._reader is None:
+            self._reader = reader_balancer.choose()
+
+        return self._reader.sync_engine
+
+    def close(self) -> None:
+        super().close()
+        self._reader = None
+
+
+def create_engine(url: str) -> AsyncEngine:
+    db_engine = create_async_engine(
+        url,
+        poolclass=InstrumentedPool,
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW,
+        pool_timeout=config.DB_POOL_TIMEOUT,
+        pool_recycle=config.DB_POOL_RECYCLE,
+        pool_pre_ping=config.DB_POOL_PRE_PING,
+        echo=config.DB_ECHO,
+        connect_args={
+            "statement_cache_size": config.DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": config.DB_STATEMENT_CACHE_SIZE,
+        },
+    )
+    event.listen(db_engine.sync_engine, "handle_error", on_engine_error)
+    event.listen(
+        db_engine.sync_engine, "before_cursor_execute", on_before_cursor_execute
+    )
+    event.listen(db_engine.sync_engine, "after_cursor_execute", on_after_cursor_execute)
+
+    return db_engine
+
+
+engine = create_engine(config.DB_URL)
+reader_engines = [create_engine(url) for url in config.DB_READER_URLS]
+reader_balancer = ReaderBalancer(
+    reader_engines or [engine], strategy=config.DB_READER_BALANCER
 )
 
 async_session_factory = async_sessionmaker(
-    engine, class_=AsyncSession, expire_on_commit=False
+    engine,
+    class_=AsyncSession,
+    sync_session_class=WriterSession,
+    expire_on_commit=False,
+)
+
+async_reader_session_factory = async_sessionmaker(
+    class_=AsyncSession, sync_session_class=ReaderSession, expire_on_commit=False
 )
 
+
 AsyncScopedSession = async_scoped_session(
     async_session_factory, scopefunc=get_session_id
 )
 
+AsyncScopedReaderSession = async_scoped_session(
+    async_reader_session_factory, scopefunc=get_session_id
+)
+
+
+@asynccontextmanager
+async def detached_session_scope(
+    primary_until: float = 0.0,
+) -> AsyncIterator[SessionScope]:
+    scope = SessionScope(session_id=uuid4().hex, primary_until=primary_until)
+    token = session_scope.set(scope)
+
+    try:
+        yield scope
+    finally:
+        await AsyncScopedSession.remove()
+        await AsyncScopedReaderSession.remove()
+        session_scope.reset(token)
+
+
+def pool_stats() -> Dict[str, Any]:
+    return {
+        "writer": engine.pool.stats(),
+        "readers": [reader_engine.pool.stats() for reader_engine in reader_engines],
+    }
+
 
 async def ping_db():
-    async with engine.begin() as conn:
-        await conn.execute(text("SELECT 1"))
+    for db_engine in [engine, *reader_engines]:
+        async with db_engine.begin() as conn:
+            await conn.execute(text("SELECT 1"))
 
 
 async def close_db():
-    await engine.dispose()
+    for db_engine in [engine, *reader_engines]:
+        await db_engine.dispose()
@@ -0,0 +1,75 @@
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db.session import AsyncScopedSession
+from app.core.logger import logger
+
+
+class UnitOfWork:
+    def __init__(self):
+        self._session: Optional[AsyncSession] = None
+        self._after_commit: List[Callable[[], Awaitable[None]]] = []
+
+    @property
+    def session(self) -> AsyncSession:
+        if self._session is None:
+            self._session = AsyncScopedSession()
+
+        return self._session
+
+    def after_commit(self, hook: Callable[[], Awaitable[None]]) -> None:
+        self._after_commit.append(hook)
+
+    async def commit(self) -> None:
+        if self._session is not None:
+            try:
+                await self._session.commit()
+            finally:
+                await self.close()
+
+        for hook in self._after_commit:
+            try:
+                await hook()
+            except Exception as e:
+                logger.error(f"Error in after-commit hook: {e}")
+
+    async def rollback(self) -> None:
+        if self._session is not None:
+            try:
+                await self._session.rollback()
+            finally:
+                await self.close()
+
+    async def close(self) -> None:
+        session, self._session = self._session, None
+        if session is not None:
+            await session.close()
+
+
+current_unit_of_work: ContextVar[Optional[UnitOfWork]] = ContextVar(
+    "unit_of_work", default=None
+)
+
+
+@asynccontextmanager
+async def unit_of_work() -> AsyncIterator[UnitOfWork]:
+    outer = current_unit_of_work.get()
+    if outer is not None:
+        yield outer
+        return
+
+    uow = UnitOfWork()
+    token = current_unit_of_work.set(uow)
+
+    try:
+        yield uow
+    except BaseException:
+        current_unit_of_work.reset(token)
+        await uow.rollback()
+        raise
+
+    current_unit_of_work.reset(token)
+    await uow.commit()
@@ -0,0 +1,76 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+
+from fastapi import Header
+
+from app.core.config import config
+from app.core.errors import error
+
+REQUEST_TIMEOUT_HEADER = "x-request-timeout"
+
+
+@dataclass
+class Deadline:
+    started_at: float
+    expires_at: Optional[float] = None
+
+
+request_deadline: ContextVar[Optional[Deadline]] = ContextVar(
+    "request_deadline", default=None
+)
+
+
+def remaining() -> Optional[float]:
+    deadline = request_deadline.get()
+    if deadline is None or deadline.expires_at is None:
+        return None
+
+    left = deadline.expires_at - time.monotonic()
+    if left <= 0:
+        raise error.DeadlineExceeded()
+
+    return left
+
+
+@asynccontextmanager
+async def deadline_timeout() -> AsyncIterator[None]:
+    timeout = remaining()
+    if timeout is None:
+        yield
+        return
+
+    # Only a timeout fired by this scope is a deadline; socket timeouts raised
+    # by the client inside it keep their own type.
+    scope = asyncio.timeout(timeout)
+    try:
+        async with scope:
+            yield
+    except TimeoutError:
+        if scope.expired():
+            raise error.DeadlineExceeded()
+        raise
+
+
+class RequestDeadline:
+    def __init__(self, timeout: float = config.REQUEST_TIMEOUT):
+        self.timeout = timeout
+
+    async def __call__(
+        self,
+        request_timeout: Optional[float] = Header(
+            None, alias=REQUEST_TIMEOUT_HEADER, gt=0
+        ),
+    ):
+        deadline = request_deadline.get()
+        if deadline is None:
+            return
+
+        timeout = self.timeout
+        if request_timeout is not None:
+            timeout = min(timeout, request_timeout)
+
+        deadline.expires_at = deadline.started_at + timeout
@@ -5,6 +5,10 @@ ERROR_400_CLASS_NOTICE_CREATION_FAILED = "40003"
 ERROR_400_CLASS_NOTICE_UPDATE_FAILED = "40004"
 ERROR_400_CLASS_NOTICE_DELETE_FAILED = "40005"
 ERROR_400_USER_CREATION_FAILED = "40006"
+ERROR_400_INVALID_CURSOR = "40007"
+ERROR_400_INVALID_IMPORT_FILE = "40008"
+ERROR_400_CLASS_STUDENT_ENROLL_FAILED = "40009"
+ERROR_400_DEADLINE_EXCEEDED = "40010"
 
 ERROR_401_INVALID_API_KEY = "40100"
 
@@ -75,3 +79,35 @@ class UserCreationFailed(BaseAPIException):
             code=ERROR_400_USER_CREATION_FAILED,
             message="User creation failed",
         )
+
+
+class InvalidCursor(BaseAPIException):
+    def __init__(self):
+        super().__init__(
+            code=ERROR_400_INVALID_CURSOR,
+            message="Invalid cursor",
+        )
+
+
+class InvalidImportFile(BaseAPIException):
+    def __init__(self):
+        super().__init__(
+            code=ERROR_400_INVALID_IMPORT_FILE,
+            message="Invalid import file",
+        )
+
+
+class ClassStudentEnrollFailed(BaseAPIException):
+    def __init__(self):
+        super().__init__(
+            code=ERROR_400_CLASS_STUDENT_ENROLL_FAILED,
+            message="Class Student enroll failed",
+        )
+
+
+class DeadlineExceeded(BaseAPIException):
+    def __init__(self):
+        super().__init__(
+            code=ERROR_400_DEADLINE_EXCEEDED,
+            message="Request deadline exceeded",
+        )
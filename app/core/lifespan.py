@@ -1,6 +1,8 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
+from app.core.config import config
+from app.core.logger import logger
 from app.core.redis import redis_cache
 from app.core.db.session import ping_db, close_db
 
@@ -8,7 +10,15 @@ from app.core.db.session import ping_db, close_db
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await ping_db()
-    await redis_cache.ping()
+
+    try:
+        await redis_cache.ping()
+    except Exception as e:
+        if not config.REDIS_DEGRADED_START:
+            raise
+
+        logger.warning(f"Redis unavailable, starting in degraded mode: {e}")
+        redis_cache.breaker.trip()
 
     yield
 
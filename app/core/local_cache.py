@@ -0,0 +1,82 @@
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+
+class LocalCache:
+    """Bounded in-process LRU placed in front of Redis.
+
+    Values are kept as the encoded bytes stored in Redis, so the memory budget
+    is exact and callers never share mutable objects through the cache.
+    """
+
+    def __init__(self, max_items: int, max_bytes: int, ttl: int):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def peek(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self.delete(key)
+            return None
+
+        return value
+
+    def get(self, key: str) -> Optional[bytes]:
+        value = self.peek(key)
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+
+        return value
+
+    def set(self, key: str, value: bytes, ttl: Optional[int] = None) -> None:
+        self.delete(key)
+
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0 or len(value) > self.max_bytes:
+            return
+
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._bytes += len(value)
+
+        while len(self._entries) > self.max_items or self._bytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+            self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry[1])
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "items": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
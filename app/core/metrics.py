@@ -0,0 +1,100 @@
+import bisect
+from dataclasses import dataclass, field
+from typing import Any, Dict, Sequence
+
+LATENCY_BUCKETS_MS = (0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+SIZE_BUCKETS_BYTES = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def percentile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 3),
+            "avg": round(self.sum / self.count, 3) if self.count else 0.0,
+            "max": round(self.max, 3),
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "buckets": {
+                **{
+                    str(bound): count for bound, count in zip(self.buckets, self.counts)
+                },
+                "+Inf": self.counts[-1],
+            },
+        }
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    errors: int = 0
+    redis_latency_ms: Histogram = field(default_factory=Histogram)
+    db_latency_ms: Histogram = field(default_factory=Histogram)
+    payload_bytes: Histogram = field(
+        default_factory=lambda: Histogram(SIZE_BUCKETS_BYTES)
+    )
+
+    def snapshot(self) -> Dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "hits": self.hits,
+            "staleHits": self.stale_hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hitRatio": (
+                round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0
+            ),
+            "redisLatencyMs": self.redis_latency_ms.snapshot(),
+            "dbLatencyMs": self.db_latency_ms.snapshot(),
+            "payloadBytes": self.payload_bytes.snapshot(),
+        }
+
+
+class CacheMetrics:
+    def __init__(self):
+        self._functions: Dict[str, CacheStats] = {}
+
+    def function(self, name: str) -> CacheStats:
+        stats = self._functions.get(name)
+        if stats is None:
+            stats = self._functions[name] = CacheStats()
+
+        return stats
+
+    def reset(self) -> None:
+        self._functions.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {name: stats.snapshot() for name, stats in self._functions.items()}
+
+
+cache_metrics = CacheMetrics()
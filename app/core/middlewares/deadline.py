@@ -0,0 +1,21 @@
+import time
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.deadline import Deadline, request_deadline
+
+
+class DeadlineMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        token = request_deadline.set(Deadline(started_at=time.monotonic()))
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            request_deadline.reset(token)
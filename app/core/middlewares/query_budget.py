@@ -0,0 +1,24 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import config
+from app.core.logger import logger
+from app.core.query_budget import count_queries
+
+
+class QueryBudgetMiddleware:
+    def __init__(self, app: ASGIApp, statements: int = config.QUERY_BUDGET_STATEMENTS):
+        self.app = app
+        self.statements = statements
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        with count_queries() as counter:
+            await self.app(scope, receive, send)
+
+        if counter.statements > self.statements:
+            logger.warning(
+                f"Query budget exceeded on {scope['method']} {scope['path']} "
+                f"(budget {self.statements}): {counter.describe()}"
+            )
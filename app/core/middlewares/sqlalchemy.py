@@ -1,12 +1,85 @@
+import math
+import time
+from http.cookies import SimpleCookie
 from uuid import uuid4
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette_context import context
+from starlette.datastructures import MutableHeaders
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from app.core.config import config
+from app.core.db.session import (
+    AsyncScopedReaderSession,
+    AsyncScopedSession,
+    SessionScope,
+    session_scope,
+)
 
-class SQLAlchemyMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        context["session_id"] = uuid4().hex
+PRIMARY_UNTIL_COOKIE = "db_primary_until"
 
-        return await call_next(request)
+
+def parse_primary_until(value: str) -> float:
+    # The cookie is client-controlled, so it can pin reads to the primary for
+    # at most one read-your-writes window from now.
+    try:
+        primary_until = float(value)
+    except ValueError:
+        return 0.0
+
+    if not math.isfinite(primary_until):
+        return 0.0
+
+    return min(primary_until, time.time() + config.DB_READ_YOUR_WRITES_WINDOW)
+
+
+def read_primary_until(scope: Scope) -> float:
+    for name, value in scope["headers"]:
+        if name == b"cookie":
+            cookies = cookie_parser(value.decode("latin-1"))
+            return parse_primary_until(cookies.get(PRIMARY_UNTIL_COOKIE, "0"))
+
+    return 0.0
+
+
+def primary_until_cookie(primary_until: float) -> str:
+    cookie = SimpleCookie()
+    cookie[PRIMARY_UNTIL_COOKIE] = str(primary_until)
+    cookie[PRIMARY_UNTIL_COOKIE]["max-age"] = config.DB_READ_YOUR_WRITES_WINDOW
+    cookie[PRIMARY_UNTIL_COOKIE]["path"] = "/"
+    cookie[PRIMARY_UNTIL_COOKIE]["httponly"] = True
+    cookie[PRIMARY_UNTIL_COOKIE]["samesite"] = "lax"
+
+    return cookie.output(header="").strip()
+
+
+class SQLAlchemyMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        primary_until = read_primary_until(scope)
+        request_scope = SessionScope(
+            session_id=uuid4().hex, primary_until=primary_until
+        )
+        token = session_scope.set(request_scope)
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start" and (
+                request_scope.primary_until > max(primary_until, time.time())
+            ):
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "set-cookie", primary_until_cookie(request_scope.primary_until)
+                )
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            await AsyncScopedSession.remove()
+            await AsyncScopedReaderSession.remove()
+            session_scope.reset(token)
@@ -0,0 +1,41 @@
+import base64
+import binascii
+from typing import Any, List
+
+import orjson
+
+from app.core.codec import from_primitive
+from app.core.errors import error
+
+
+def encode_cursor(*values: Any) -> str:
+    return base64.urlsafe_b64encode(orjson.dumps(values)).rstrip(b"=").decode()
+
+
+def decode_value(type_: type, value: Any) -> Any:
+    # Cursors are client input: a value of the wrong JSON type would otherwise
+    # reach the database as a mistyped parameter.
+    if value is None:
+        raise ValueError(value)
+
+    if type_ in (int, float, str):
+        expected = (int, float) if type_ is float else type_
+        if isinstance(value, bool) or not isinstance(value, expected):
+            raise ValueError(value)
+
+        return type_(value)
+
+    return from_primitive(type_, value)
+
+
+def decode_cursor(cursor: str, *types: type) -> List[Any]:
+    try:
+        values = orjson.loads(
+            base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        )
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError(cursor)
+
+        return [decode_value(type_, value) for type_, value in zip(types, values)]
+    except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError):
+        raise error.InvalidCursor()
@@ -0,0 +1,77 @@
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, Optional, Tuple
+
+
+class QueryBudgetExceeded(AssertionError): ...
+
+
+@dataclass
+class QueryCounter:
+    statements: int = 0
+    redis_calls: int = 0
+    statement_counts: Counter = field(default_factory=Counter)
+
+    def most_repeated(self) -> Optional[Tuple[str, int]]:
+        if not self.statement_counts:
+            return None
+
+        return self.statement_counts.most_common(1)[0]
+
+    def describe(self) -> str:
+        description = f"{self.statements} statements, {self.redis_calls} Redis calls"
+
+        repeated = self.most_repeated()
+        if repeated and repeated[1] > 1:
+            statement, count = repeated
+            description += f"; repeated {count} times: {' '.join(statement.split())}"
+
+        return description
+
+
+query_counters: ContextVar[Tuple[QueryCounter, ...]] = ContextVar(
+    "query_counters", default=()
+)
+
+
+def count_statement(statement: str) -> None:
+    for counter in query_counters.get():
+        counter.statements += 1
+        counter.statement_counts[statement] += 1
+
+
+def count_redis_call() -> None:
+    for counter in query_counters.get():
+        counter.redis_calls += 1
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryCounter]:
+    counter = QueryCounter()
+    token = query_counters.set((*query_counters.get(), counter))
+
+    try:
+        yield counter
+    finally:
+        query_counters.reset(token)
+
+
+@contextmanager
+def query_budget(
+    statements: Optional[int] = None, redis_calls: Optional[int] = None
+) -> Iterator[QueryCounter]:
+    with count_queries() as counter:
+        yield counter
+
+    limits = []
+    if statements is not None and counter.statements > statements:
+        limits.append(f"{statements} statements")
+    if redis_calls is not None and counter.redis_calls > redis_calls:
+        limits.append(f"{redis_calls} Redis calls")
+
+    if limits:
+        raise QueryBudgetExceeded(
+            f"Expected at most {' and '.join(limits)}, got {counter.describe()}"
+        )
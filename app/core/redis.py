@@ -1,62 +1,575 @@
-import pickle
-from functools import wraps
-from typing import Callable
+import asyncio
+import contextvars
+import struct
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from functools import partial, wraps
+from string import Formatter
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    get_type_hints,
+)
 
-from redis.asyncio import Redis
+from redis.asyncio import BlockingConnectionPool, Redis
+from redis.asyncio.lock import Lock
+from redis.exceptions import LockError, RedisError, WatchError
 
 from app.core.config import config
+from app.core.circuit_breaker import CircuitBreaker, CircuitBreakerOpen
+from app.core.codec import get_codec
+from app.core.db.session import detached_session_scope, is_primary_pinned
+from app.core.db.uow import current_unit_of_work
+from app.core.errors.error import BaseAPIException
+from app.core.deadline import Deadline, deadline_timeout, request_deadline
+from app.core.query_budget import count_redis_call, query_counters
+from app.core.timing import CACHE, measure, server_timing
 from app.core.logger import logger
+from app.core.local_cache import LocalCache
+from app.core.metrics import CacheStats, cache_metrics
+
+# Returned by RedisCache.get for absent keys, so a cached None can be told apart.
+MISSING = object()
+
+# Every stored payload starts with the wall-clock time it stays fresh until.
+FRESH_UNTIL = struct.Struct("!d")
+
+
+@dataclass
+class CacheEntry:
+    value: object
+    fresh_until: float
+    size: int = 0
+
+    @property
+    def stale(self) -> bool:
+        return self.fresh_until <= time.time()
 
 
 class RedisCache:
     def __init__(self):
-        self.redis = Redis(
-            host=config.REDIS_HOST,
-            port=config.REDIS_PORT,
+        self.redis = Redis.from_pool(
+            BlockingConnectionPool(
+                host=config.REDIS_HOST,
+                port=config.REDIS_PORT,
+                max_connections=config.REDIS_MAX_CONNECTIONS,
+                timeout=config.REDIS_POOL_TIMEOUT,
+                socket_timeout=config.REDIS_SOCKET_TIMEOUT,
+                socket_connect_timeout=config.REDIS_SOCKET_CONNECT_TIMEOUT,
+                socket_keepalive=config.REDIS_SOCKET_KEEPALIVE,
+                health_check_interval=config.REDIS_HEALTH_CHECK_INTERVAL,
+            )
+        )
+        self.breaker = CircuitBreaker(
+            "redis",
+            failure_threshold=config.REDIS_CIRCUIT_FAILURE_THRESHOLD,
+            recovery_timeout=config.REDIS_CIRCUIT_RECOVERY_TIMEOUT,
+            expected_exceptions=(RedisError, OSError, asyncio.TimeoutError),
         )
+        self.codec = get_codec(
+            config.CACHE_CODEC,
+            compression_threshold=config.CACHE_COMPRESSION_THRESHOLD,
+        )
+        self.namespace = f"v{config.CACHE_SCHEMA_VERSION}.{self.codec.name}"
+        self.local = (
+            LocalCache(
+                max_items=config.LOCAL_CACHE_MAX_ITEMS,
+                max_bytes=config.LOCAL_CACHE_MAX_BYTES,
+                ttl=config.LOCAL_CACHE_TTL,
+            )
+            if config.LOCAL_CACHE_ENABLED
+            else None
+        )
+
+    @asynccontextmanager
+    async def command(self) -> AsyncIterator[None]:
+        async with self.breaker, deadline_timeout():
+            count_redis_call()
+            with measure(CACHE):
+                yield
 
     async def ping(self) -> None:
-        await self.redis.ping()
+        async with self.command():
+            await self.redis.ping()
 
     async def close(self) -> None:
         await self.redis.close()
 
-    async def set(self, key: str, value: object, ttl: int = None) -> None:
-        await self.redis.set(key, pickle.dumps(value), ex=ttl)
+    def tag_key(self, tag: str) -> str:
+        return f"tag:{tag}"
+
+    def lock_key(self, key: str) -> str:
+        return f"lock:{key}"
+
+    def version_key(self, tag: str) -> str:
+        return f"tagver:{tag}"
+
+    def encode(self, value: object, ttl: int = None) -> bytes:
+        fresh_until = time.time() + ttl if ttl else float("inf")
+        return FRESH_UNTIL.pack(fresh_until) + self.codec.dumps(value)
+
+    def decode(self, data: bytes, type_: Optional[type] = None) -> CacheEntry:
+        (fresh_until,) = FRESH_UNTIL.unpack_from(data)
+        return CacheEntry(
+            value=self.codec.loads(data[FRESH_UNTIL.size :], type_),
+            fresh_until=fresh_until,
+            size=len(data),
+        )
+
+    async def set(
+        self,
+        key: str,
+        value: object,
+        ttl: int = None,
+        tags: Iterable[str] = (),
+        hard_ttl: int = None,
+        versions: Optional[List[Optional[bytes]]] = None,
+    ) -> int:
+        return await self.mset(
+            {key: value}, ttl=ttl, tags=tags, hard_ttl=hard_ttl, versions=versions
+        )
+
+    async def mset(
+        self,
+        mapping: Dict[str, object],
+        ttl: int = None,
+        tags: Iterable[str] = (),
+        hard_ttl: int = None,
+        versions: Optional[List[Optional[bytes]]] = None,
+    ) -> int:
+        encoded = {key: self.encode(value, ttl=ttl) for key, value in mapping.items()}
+        tags = list(tags)
+        version_keys = [self.version_key(tag) for tag in tags]
+
+        # With versions (read before the values were loaded), the write only
+        # happens if none of the tags was invalidated in the meantime.
+        checked = versions is not None and bool(version_keys)
+
+        async with self.command(), self.redis.pipeline(transaction=checked) as pipe:
+            if checked:
+                await pipe.watch(*version_keys)
+                if await pipe.mget(version_keys) != versions:
+                    return 0
+                pipe.multi()
+
+            for key, data in encoded.items():
+                pipe.set(key, data, ex=max(ttl or 0, hard_ttl or 0) or None)
+            for tag in tags:
+                pipe.sadd(self.tag_key(tag), *encoded)
+                pipe.expire(self.tag_key(tag), config.CACHE_TAG_TTL)
+
+            try:
+                await pipe.execute()
+            except WatchError:
+                return 0
+
+        if self.local is not None:
+            for key, data in encoded.items():
+                self.local.set(key, data, ttl=ttl)
+
+        return sum(len(data) for data in encoded.values())
 
-    async def get(self, key: str) -> object:
-        value = await self.redis.get(key)
-        return pickle.loads(value)
+    async def get_entry(
+        self, key: str, type_: Optional[type] = None
+    ) -> Optional[CacheEntry]:
+        (entry,) = await self.mget_entries([key], type_=type_)
+        return entry
+
+    async def get(self, key: str, type_: Optional[type] = None) -> object:
+        entry = await self.get_entry(key, type_=type_)
+        return MISSING if entry is None else entry.value
+
+    async def mget_entries(
+        self, keys: List[str], type_: Optional[type] = None
+    ) -> List[Optional[CacheEntry]]:
+        found: Dict[str, bytes] = {}
+
+        if self.local is not None:
+            for key in keys:
+                data = self.local.get(key)
+                if data is not None:
+                    found[key] = data
+
+        remote_keys = [key for key in keys if key not in found]
+        if remote_keys:
+            async with self.command():
+                values = await self.redis.mget(remote_keys)
+
+            for key, data in zip(remote_keys, values):
+                if data is not None:
+                    found[key] = data
+                    if self.local is not None:
+                        self.local.set(key, data)
+
+        return [
+            self.decode(found[key], type_) if key in found else None for key in keys
+        ]
+
+    async def mget(self, keys: List[str], type_: Optional[type] = None) -> List[object]:
+        entries = await self.mget_entries(keys, type_=type_)
+        return [MISSING if entry is None else entry.value for entry in entries]
+
+    async def delete_many(self, keys: Iterable[str]) -> None:
+        keys = list(keys)
+        if not keys:
+            return
+
+        async with self.command():
+            await self.redis.unlink(*keys)
+
+        if self.local is not None:
+            for key in keys:
+                self.local.delete(key)
 
     async def exists(self, key: str) -> bool:
-        return await self.redis.exists(key)
+        if self.local is not None and self.local.peek(key) is not None:
+            return True
+
+        async with self.command():
+            return await self.redis.exists(key)
+
+    async def invalidate_tags(self, *tags: str) -> List[str]:
+        tag_keys = [self.tag_key(tag) for tag in tags]
+        if not tag_keys:
+            return []
+
+        async with self.command(), self.redis.pipeline(transaction=False) as pipe:
+            for tag in tags:
+                pipe.incr(self.version_key(tag))
+                pipe.expire(self.version_key(tag), config.CACHE_TAG_TTL)
+            for tag_key in tag_keys:
+                pipe.smembers(tag_key)
+            members = (await pipe.execute())[2 * len(tags) :]
+
+        keys = list({key.decode() for tag_members in members for key in tag_members})
+        await self.delete_many([*keys, *tag_keys])
+
+        return keys
+
+    async def tag_versions(self, tags: List[str]) -> List[Optional[bytes]]:
+        if not tags:
+            return []
+
+        async with self.command():
+            return await self.redis.mget([self.version_key(tag) for tag in tags])
+
+    async def acquire_lock(self, key: str, ttl: float) -> Optional[Lock]:
+        lock = self.redis.lock(self.lock_key(key), timeout=ttl, blocking=False)
+
+        async with self.command():
+            if await lock.acquire():
+                return lock
+
+        return None
+
+    async def release_lock(self, lock: Lock) -> None:
+        try:
+            async with self.command():
+                await lock.release()
+        except LockError:
+            logger.warning(f"Cache lock {lock.name} expired before release")
+
+    async def is_locked(self, key: str) -> bool:
+        async with self.command():
+            return await self.redis.exists(self.lock_key(key))
 
 
 class RedisCacheDecorator:
-    def __init__(self, ttl: int = 60):
+    def __init__(
+        self,
+        ttl: int = 60,
+        hard_ttl: Optional[int] = None,
+        tags: Iterable[str] = (),
+        negative_ttl: int = config.CACHE_NEGATIVE_TTL,
+        lock_ttl: float = config.CACHE_LOCK_TTL,
+        lock_poll_interval: float = config.CACHE_LOCK_POLL_INTERVAL,
+    ):
         self.ttl = ttl
+        self.hard_ttl = hard_ttl
+        self.tags = tags
+        self._tag_fields = [
+            (tag, [name for _, name, _, _ in Formatter().parse(tag) if name])
+            for tag in tags
+        ]
+        self.negative_ttl = negative_ttl
+        self.lock_ttl = lock_ttl
+        self.lock_poll_interval = lock_poll_interval
+
+        self.type_ = None
+        self.stats = CacheStats()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._revalidating: Dict[str, asyncio.Task] = {}
 
     def key_builder(self, f, kwargs) -> str:
-        return f"{f.__name__}.{str(kwargs)}"
+        return f"{redis_cache.namespace}:{f.__name__}.{str(kwargs)}"
+
+    def return_type(self, f) -> Optional[type]:
+        try:
+            return get_type_hints(f).get("return")
+        except Exception:
+            return None
+
+    def tags_builder(self, kwargs) -> List[str]:
+        # A tag naming an argument that was not given (an unscoped query) is
+        # skipped; those entries only expire through their TTL.
+        return [
+            tag.format(**kwargs)
+            for tag, fields in self._tag_fields
+            if all(kwargs.get(name) is not None for name in fields)
+        ]
+
+    def cache_error(self, e: Exception) -> None:
+        self.stats.errors += 1
+
+        if isinstance(e, CircuitBreakerOpen):
+            logger.debug(f"Skipping cache: {e}")
+        else:
+            logger.error(f"Error in cache decorator: {e}")
+
+    async def wait_for_result(self, key: str) -> object:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.lock_ttl
+
+        while loop.time() < deadline:
+            await asyncio.sleep(self.lock_poll_interval)
+
+            result = await redis_cache.get(key, type_=self.type_)
+            if result is not MISSING:
+                return result
+            if not await redis_cache.is_locked(key):
+                break
+
+        return MISSING
+
+    async def load(
+        self, func: Callable, key: str, args, kwargs, wait: bool = True
+    ) -> object:
+        lock = None
+
+        try:
+            lock = await redis_cache.acquire_lock(key, ttl=self.lock_ttl)
+            if lock is None:
+                if not wait:
+                    return MISSING
+
+                logger.debug("Cache recompute in progress, waiting")
+                result = await self.wait_for_result(key)
+                if result is not MISSING:
+                    return result
+        except Exception as e:
+            self.cache_error(e)
+
+        tags = self.tags_builder(kwargs)
+        try:
+            versions = await redis_cache.tag_versions(tags)
+        except Exception as e:
+            self.cache_error(e)
+            versions = None
+
+        try:
+            started = time.perf_counter()
+            result = await func(*args, **kwargs)
+            self.stats.db_latency_ms.observe((time.perf_counter() - started) * 1000)
+
+            if result is None:
+                ttl, hard_ttl = self.negative_ttl, None
+            else:
+                ttl, hard_ttl = self.ttl, self.hard_ttl
+
+            # Without the tag versions a concurrent invalidation could not be
+            # detected, so the result is not cached.
+            if ttl and versions is not None:
+                logger.debug("Setting cache")
+                try:
+                    size = await redis_cache.set(
+                        key,
+                        result,
+                        ttl=ttl,
+                        tags=tags,
+                        hard_ttl=hard_ttl,
+                        versions=versions,
+                    )
+                    self.stats.payload_bytes.observe(size)
+                except Exception as e:
+                    self.cache_error(e)
+        finally:
+            if lock is not None:
+                try:
+                    await redis_cache.release_lock(lock)
+                except Exception as e:
+                    self.cache_error(e)
+
+        return result
+
+    async def revalidate(self, func: Callable, key: str, args, kwargs) -> None:
+        try:
+            await self.load(func, key, args, kwargs, wait=False)
+        except Exception as e:
+            logger.error(f"Cache revalidation failed, serving stale value: {e}")
+
+    async def detached(self, coro) -> object:
+        # Shared loads get their own budget; each waiter still bounds its wait
+        # by its own request deadline.
+        now = time.monotonic()
+        request_deadline.set(
+            Deadline(started_at=now, expires_at=now + config.REQUEST_TIMEOUT)
+        )
+
+        async with detached_session_scope():
+            return await coro()
+
+    def single_flight(
+        self,
+        tasks: Dict[str, asyncio.Task],
+        key: str,
+        coro,
+        background: bool = False,
+    ) -> asyncio.Task:
+        task = tasks.get(key)
+
+        if task is None:
+            # Shared work can outlive the request that started it, so it runs
+            # in a fresh context with its own session scope and deadline rather
+            # than the caller's. A load the caller waits on is still counted in
+            # the caller's query budget and Server-Timing.
+            context = contextvars.Context()
+            if not background:
+                context.run(query_counters.set, query_counters.get())
+                context.run(server_timing.set, server_timing.get())
+
+            task = asyncio.create_task(self.detached(coro), context=context)
+            tasks[key] = task
+            task.add_done_callback(lambda _: tasks.pop(key, None))
+
+        return task
 
     def __call__(self, func):
+        self.type_ = self.return_type(func)
+        self.stats = cache_metrics.function(
+            getattr(func, "__qualname__", func.__name__)
+        )
+
         @wraps(func)
         async def wrapper(*args, **kwargs):
+            # A client pinned to the primary after its own write must not be
+            # served a shared entry or join a shared load: either may hold a
+            # lagging replica's pre-write rows.
+            if is_primary_pinned():
+                logger.debug("Primary pinned, bypassing cache")
+                return await func(*args, **kwargs)
+
             _key = self.key_builder(func, kwargs=kwargs)
 
             try:
-                if await redis_cache.exists(_key):
-                    logger.debug("Cache hit")
-                    result = await redis_cache.get(_key)
-                else:
-                    logger.debug("Cache miss")
-                    result = await func(*args, **kwargs)
-                    if result:
-                        logger.debug("Setting cache")
-                        await redis_cache.set(_key, result, ttl=self.ttl)
+                started = time.perf_counter()
+                entry = await redis_cache.get_entry(_key, type_=self.type_)
+                self.stats.redis_latency_ms.observe(
+                    (time.perf_counter() - started) * 1000
+                )
+
+                if entry is not None:
+                    self.stats.payload_bytes.observe(entry.size)
+
+                    if entry.stale:
+                        logger.debug("Cache stale, revalidating")
+                        self.stats.stale_hits += 1
+                        self.single_flight(
+                            self._revalidating,
+                            _key,
+                            partial(self.revalidate, func, _key, args, kwargs),
+                            background=True,
+                        )
+                    else:
+                        logger.debug("Cache hit")
+                        self.stats.hits += 1
+
+                    return entry.value
             except Exception as e:
-                logger.error(f"Error in cache decorator: {e}")
-                result = await func(*args, **kwargs)
+                self.cache_error(e)
+
+            logger.debug("Cache miss")
+            self.stats.misses += 1
+
+            # Concurrent misses on the same key share a single load. The load
+            # runs in its own task so a cancelled caller does not cancel it for
+            # the others.
+            task = self.single_flight(
+                self._inflight, _key, partial(self.load, func, _key, args, kwargs)
+            )
+
+            async with deadline_timeout():
+                return await asyncio.shield(task)
+
+        return wrapper
+
+
+class RedisCacheInvalidateDecorator:
+    def __init__(
+        self,
+        tags: Iterable[str],
+        result_tags: Optional[Callable[[Any], Iterable[str]]] = None,
+        replica_lag: float = (
+            config.DB_READ_YOUR_WRITES_WINDOW if config.DB_READER_URLS else 0
+        ),
+    ):
+        self.tags = tags
+        self.result_tags = result_tags
+        self.replica_lag = replica_lag
+        self._delayed: Set[asyncio.Task] = set()
+
+    def tags_builder(self, kwargs) -> List[str]:
+        return [tag.format(**kwargs) for tag in self.tags]
+
+    async def invalidate(self, tags: List[str], delay: float = 0) -> None:
+        if delay:
+            await asyncio.sleep(delay)
+
+        # The write has already committed, so the purge must not be cut short
+        # by the request deadline: a skipped purge serves pre-write data for
+        # the whole TTL.
+        token = request_deadline.set(None)
+        try:
+            await redis_cache.invalidate_tags(*tags)
+        except Exception as e:
+            message = e.message if isinstance(e, BaseAPIException) else e
+            logger.error(f"Error in cache invalidation: {message}")
+        finally:
+            request_deadline.reset(token)
+
+    async def invalidate_committed(self, tags: List[str]) -> None:
+        await self.invalidate(tags)
+
+        if self.replica_lag:
+            task = asyncio.create_task(
+                self.invalidate(tags, self.replica_lag), context=contextvars.Context()
+            )
+            self._delayed.add(task)
+            task.add_done_callback(self._delayed.discard)
+
+    def __call__(self, func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            result = await func(*args, **kwargs)
+
+            tags = self.tags_builder(kwargs)
+            if self.result_tags and result is not None:
+                tags.extend(self.result_tags(result))
+
+            if not tags:
+                return result
+
+            uow = current_unit_of_work.get()
+            if uow is not None:
+                uow.after_commit(partial(self.invalidate_committed, tags))
+            else:
+                await self.invalidate_committed(tags)
 
             return result
 
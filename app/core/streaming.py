@@ -0,0 +1,109 @@
+import codecs
+import csv
+from typing import Any, AsyncIterator, Dict, Optional, Tuple, Union
+
+import orjson
+
+from app.core.errors import error
+
+CSV = "csv"
+NDJSON = "ndjson"
+
+CONTENT_TYPES = {
+    "text/csv": CSV,
+    "application/x-ndjson": NDJSON,
+    "application/ndjson": NDJSON,
+    "application/jsonl": NDJSON,
+}
+
+Record = Union[Dict[str, Any], str]
+
+
+def get_format(content_type: Optional[str]) -> str:
+    media_type = (content_type or "").split(";")[0].strip().lower()
+
+    if media_type not in CONTENT_TYPES:
+        raise error.InvalidImportFile()
+
+    return CONTENT_TYPES[media_type]
+
+
+async def iter_lines(
+    chunks: AsyncIterator[bytes], max_line_length: int
+) -> AsyncIterator[Tuple[int, Optional[str]]]:
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    line_no = 0
+    skipping = False
+
+    def decode(chunk: bytes, final: bool = False) -> str:
+        try:
+            return decoder.decode(chunk, final)
+        except UnicodeDecodeError:
+            raise error.InvalidImportFile()
+
+    async for chunk in chunks:
+        *lines, buffer = (buffer + decode(chunk)).split("\n")
+
+        for line in lines:
+            if skipping:
+                skipping = False
+                continue
+
+            line_no += 1
+            yield line_no, line.rstrip("\r") if len(line) <= max_line_length else None
+
+        if skipping:
+            buffer = ""
+        elif len(buffer) > max_line_length:
+            line_no += 1
+            skipping = True
+            buffer = ""
+            yield line_no, None
+
+    buffer += decode(b"", final=True)
+    if buffer and not skipping:
+        yield line_no + 1, buffer.rstrip("\r")
+
+
+async def iter_records(
+    chunks: AsyncIterator[bytes], format_: str, max_line_length: int
+) -> AsyncIterator[Tuple[int, Record]]:
+    header = None
+
+    async for line_no, line in iter_lines(chunks, max_line_length):
+        if line is None:
+            yield line_no, "Line too long"
+            continue
+        if not line.strip():
+            continue
+
+        if format_ == NDJSON:
+            try:
+                record = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                yield line_no, "Invalid JSON"
+                continue
+
+            if not isinstance(record, dict):
+                yield line_no, "Expected a JSON object"
+                continue
+
+            yield line_no, record
+            continue
+
+        try:
+            values = next(csv.reader([line]))
+        except csv.Error:
+            yield line_no, "Invalid CSV"
+            continue
+
+        if header is None:
+            header = [value.strip() for value in values]
+            continue
+
+        if len(values) != len(header):
+            yield line_no, "Column count does not match header"
+            continue
+
+        yield line_no, dict(zip(header, values))
@@ -0,0 +1,107 @@
+import inspect
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import wraps
+from typing import Dict, Iterator, Optional, Set
+
+DB = "db"
+CACHE = "cache"
+SERVICE = "service"
+SERIALIZE = "serialize"
+TOTAL = "total"
+
+DESCRIPTIONS = {DB: "queries", CACHE: "commands"}
+
+
+@dataclass
+class Timing:
+    count: int = 0
+    duration_ms: float = 0.0
+
+
+class ServerTiming:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.timings: Dict[str, Timing] = {}
+        self._active: Set[str] = set()
+
+    def record(self, name: str, duration_ms: float) -> None:
+        timing = self.timings.get(name)
+        if timing is None:
+            timing = self.timings[name] = Timing()
+
+        timing.count += 1
+        timing.duration_ms += duration_ms
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        # Nested scopes of the same name (a service method calling another)
+        # are only counted once.
+        if name in self._active:
+            yield
+            return
+
+        self._active.add(name)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._active.discard(name)
+            self.record(name, (time.perf_counter() - started) * 1000)
+
+    def header(self) -> str:
+        metrics = []
+
+        for name, timing in self.timings.items():
+            metric = f"{name};dur={timing.duration_ms:.1f}"
+            if name in DESCRIPTIONS:
+                metric += f';desc="{timing.count} {DESCRIPTIONS[name]}"'
+            metrics.append(metric)
+
+        total_ms = (time.perf_counter() - self.started) * 1000
+        metrics.append(f"{TOTAL};dur={total_ms:.1f}")
+
+        return ", ".join(metrics)
+
+
+server_timing: ContextVar[Optional[ServerTiming]] = ContextVar(
+    "server_timing", default=None
+)
+
+
+def record(name: str, duration_ms: float) -> None:
+    timing = server_timing.get()
+    if timing is not None:
+        timing.record(name, duration_ms)
+
+
+@contextmanager
+def measure(name: str) -> Iterator[None]:
+    timing = server_timing.get()
+    if timing is None:
+        yield
+        return
+
+    with timing.measure(name):
+        yield
+
+
+def timed(name: str):
+    def decorate(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            with measure(name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    def decorator(cls):
+        for attr, value in list(vars(cls).items()):
+            if not attr.startswith("_") and inspect.iscoroutinefunction(value):
+                setattr(cls, attr, decorate(value))
+
+        return cls
+
+    return decorator
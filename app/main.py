@@ -1,11 +1,13 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from starlette_context.middleware import ContextMiddleware
 
 from app.core.config import config
 from app.core.lifespan import lifespan
 from app.core.container import Container
+from app.core.middlewares.deadline import DeadlineMiddleware
+from app.core.middlewares.query_budget import QueryBudgetMiddleware
 from app.core.middlewares.sqlalchemy import SQLAlchemyMiddleware
+from app.core.middlewares.timing import ServerTimingMiddleware
 from app.core.errors.error import BaseAPIException, BaseAuthException
 from app.core.errors.handler import api_error_handler, api_auth_error_handler
 from app.routers import router
@@ -28,7 +30,11 @@ def create_app(container=Container()) -> FastAPI:
         allow_headers=["*"],
     )
     app.add_middleware(SQLAlchemyMiddleware)
-    app.add_middleware(ContextMiddleware)
+    app.add_middleware(DeadlineMiddleware)
+    if config.QUERY_BUDGET_STATEMENTS:
+        app.add_middleware(QueryBudgetMiddleware)
+    if config.SERVER_TIMING_ENABLED:
+        app.add_middleware(ServerTimingMiddleware)
 
     return app
 
@@ -1,19 +1,34 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import String, DateTime
+from sqlalchemy import DateTime, Index, String, column, desc
 from sqlalchemy.orm import Mapped
 from sqlalchemy.orm import mapped_column
 
+from app.core.db.query import search_vector
 from app.core.db.session import Base
 
 
 class Class(Base):
     __tablename__ = "class"
+    __table_args__ = (
+        Index("ix_class_created_at_class_id", desc("created_at"), desc("class_id")),
+        Index(
+            "ix_class_teacher_id_created_at_class_id",
+            "teacher_id",
+            desc("created_at"),
+            desc("class_id"),
+        ),
+        Index(
+            "ix_class_class_name_pattern",
+            "class_name",
+            postgresql_ops={"class_name": "text_pattern_ops"},
+        ),
+    )
 
     class_id: Mapped[str] = mapped_column(String(255), primary_key=True)
     class_name: Mapped[str] = mapped_column(String(255), nullable=False)
-    teacher_id: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    teacher_id: Mapped[str] = mapped_column(String(255), nullable=False)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, default=datetime.now()
     )
@@ -21,9 +36,28 @@ class Class(Base):
 
 class ClassNotice(Base):
     __tablename__ = "class_notice"
+    __table_args__ = (
+        Index(
+            "ix_class_notice_class_id_created_at_id",
+            "class_id",
+            desc("created_at"),
+            desc("id"),
+        ),
+        Index(
+            "ix_class_notice_message_tsvector",
+            search_vector(column("message")),
+            postgresql_using="gin",
+        ),
+        Index(
+            "ix_class_notice_message_trgm",
+            "message",
+            postgresql_using="gin",
+            postgresql_ops={"message": "gin_trgm_ops"},
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    class_id: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    class_id: Mapped[str] = mapped_column(String(255), nullable=False)
     message: Mapped[str] = mapped_column(String(255), nullable=False)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, default=datetime.now()
@@ -35,6 +69,9 @@ class ClassNotice(Base):
 
 class ClassStudent(Base):
     __tablename__ = "class_student"
+    __table_args__ = (
+        Index("ix_class_student_student_id_class_id", "student_id", "class_id"),
+    )
 
     class_id: Mapped[str] = mapped_column(String(255), nullable=False, primary_key=True)
     student_id: Mapped[str] = mapped_column(
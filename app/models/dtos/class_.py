@@ -13,6 +13,14 @@ class ClassDTO:
     created_at: Optional[datetime] = None
 
 
+@dataclass
+class ClassBulkItemDTO:
+    index: int
+    data: Optional[ClassDTO] = None
+    error_code: Optional[str] = None
+    error_message: Optional[str] = None
+
+
 @dataclass
 class ClassListDTO:
     data: List[ClassDTO]
@@ -28,7 +36,35 @@ class ClassNoticeDTO:
     updated_at: Optional[datetime] = None
 
 
+@dataclass
+class ClassNoticeBroadcastDTO:
+    message: str
+    class_ids: Optional[List[str]] = None
+    teacher_id: Optional[str] = None
+
+
 @dataclass
 class ClassNoticeListDTO:
     data: List[ClassNoticeDTO]
     page: PageDTO
+
+
+@dataclass
+class ClassStudentDTO:
+    class_id: str
+    student_id: str
+    student_name: str
+    created_at: Optional[datetime] = None
+
+
+@dataclass
+class ClassStudentListDTO:
+    data: List[ClassStudentDTO]
+    page: PageDTO
+
+
+@dataclass
+class ClassEnrollDTO:
+    enrolled: List[str]
+    already_enrolled: List[str]
+    not_found: List[str]
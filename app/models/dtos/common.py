@@ -1,8 +1,17 @@
 from dataclasses import dataclass
+from typing import Optional
 
 
 @dataclass
 class PageDTO:
-    total: int
-    page: int
+    total: Optional[int]
+    page: Optional[int]
     limit: int
+    next_cursor: Optional[str] = None
+    total_estimated: bool = False
+
+
+@dataclass
+class CountDTO:
+    total: int
+    estimated: bool = False
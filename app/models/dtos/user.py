@@ -1,5 +1,5 @@
-from typing import Optional
-from dataclasses import dataclass
+from typing import List, Optional
+from dataclasses import dataclass, field
 from datetime import datetime
 
 from app.models.constant import UserRole
@@ -11,3 +11,16 @@ class UserDTO:
     user_name: str
     user_role: UserRole
     created_at: Optional[datetime] = None
+
+
+@dataclass
+class UserImportRejectDTO:
+    line: int
+    reason: str
+
+
+@dataclass
+class UserImportDTO:
+    imported: int = 0
+    rejected: int = 0
+    rejected_rows: List[UserImportRejectDTO] = field(default_factory=list)
@@ -2,15 +2,21 @@ from uuid import uuid4
 from datetime import datetime
 from typing import Optional, List
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from pydantic.dataclasses import dataclass
 
 from app.models.dtos.class_ import (
+    ClassBulkItemDTO,
     ClassDTO,
+    ClassEnrollDTO,
+    ClassNoticeBroadcastDTO,
     ClassNoticeDTO,
     ClassListDTO,
     ClassNoticeListDTO,
+    ClassStudentDTO,
+    ClassStudentListDTO,
 )
+from app.core.config import config
 from app.models.schemas.common import PageResp
 
 
@@ -43,6 +49,39 @@ class ClassResp:
         )
 
 
+@dataclass
+class ClassBulkItemResp:
+    index: int = Field(..., title="Index")
+    success: bool = Field(..., title="Success")
+    data: Optional[ClassResp] = Field(None, title="Data")
+    errorCode: Optional[str] = Field(None, title="Error Code")
+    errorMessage: Optional[str] = Field(None, title="Error Message")
+
+    @classmethod
+    def from_dto(cls, dto: ClassBulkItemDTO) -> "ClassBulkItemResp":
+        return cls(
+            index=dto.index,
+            success=dto.data is not None,
+            data=ClassResp.from_dto(dto.data) if dto.data else None,
+            errorCode=dto.error_code,
+            errorMessage=dto.error_message,
+        )
+
+
+@dataclass
+class ClassBulkResp:
+    data: List[ClassBulkItemResp] = Field(..., title="Data")
+    succeeded: int = Field(..., title="Succeeded")
+    failed: int = Field(..., title="Failed")
+
+    @classmethod
+    def from_dto(cls, dtos: List[ClassBulkItemDTO]) -> "ClassBulkResp":
+        data = [ClassBulkItemResp.from_dto(dto) for dto in dtos]
+        succeeded = sum(item.success for item in data)
+
+        return cls(data=data, succeeded=succeeded, failed=len(data) - succeeded)
+
+
 @dataclass
 class ClassListResp:
     data: List[ClassResp] = Field(..., title="Data")
@@ -86,6 +125,41 @@ class ClassNoticeResp:
         )
 
 
+class ClassNoticeBroadcastReq(BaseModel):
+    message: str = Field(..., title="Message")
+    classIds: Optional[List[str]] = Field(
+        None, title="Class IDs", min_length=1, max_length=config.BULK_MAX_ITEMS
+    )
+    teacherId: Optional[str] = Field(None, title="Teacher ID")
+
+    @model_validator(mode="after")
+    def check_target(self) -> "ClassNoticeBroadcastReq":
+        if (self.classIds is None) == (self.teacherId is None):
+            raise ValueError("Exactly one of classIds or teacherId is required")
+
+        return self
+
+    def to_dto(self) -> ClassNoticeBroadcastDTO:
+        return ClassNoticeBroadcastDTO(
+            message=self.message,
+            class_ids=self.classIds,
+            teacher_id=self.teacherId,
+        )
+
+
+@dataclass
+class ClassNoticeBroadcastResp:
+    data: List[ClassNoticeResp] = Field(..., title="Data")
+    count: int = Field(..., title="Count")
+
+    @classmethod
+    def from_dto(cls, dtos: List[ClassNoticeDTO]) -> "ClassNoticeBroadcastResp":
+        return cls(
+            data=[ClassNoticeResp.from_dto(class_notice) for class_notice in dtos],
+            count=len(dtos),
+        )
+
+
 @dataclass
 class ClassNoticeListResp:
     data: List[ClassNoticeResp] = Field(..., title="Data")
@@ -97,3 +171,52 @@ class ClassNoticeListResp:
             data=[ClassNoticeResp.from_dto(class_notice) for class_notice in dto.data],
             page=PageResp.from_dto(dto.page),
         )
+
+
+class ClassEnrollReq(BaseModel):
+    studentIds: List[str] = Field(
+        ..., title="Student IDs", min_length=1, max_length=config.BULK_MAX_ITEMS
+    )
+
+
+@dataclass
+class ClassEnrollResp:
+    enrolled: List[str] = Field(..., title="Enrolled")
+    alreadyEnrolled: List[str] = Field(..., title="Already Enrolled")
+    notFound: List[str] = Field(..., title="Not Found")
+
+    @classmethod
+    def from_dto(cls, dto: ClassEnrollDTO) -> "ClassEnrollResp":
+        return cls(
+            enrolled=dto.enrolled,
+            alreadyEnrolled=dto.already_enrolled,
+            notFound=dto.not_found,
+        )
+
+
+@dataclass
+class ClassStudentResp:
+    studentId: str = Field(..., title="Student ID")
+    studentName: str = Field(..., title="Student Name")
+    enrolledAt: datetime = Field(..., title="Enrolled At")
+
+    @classmethod
+    def from_dto(cls, dto: ClassStudentDTO) -> "ClassStudentResp":
+        return cls(
+            studentId=dto.student_id,
+            studentName=dto.student_name,
+            enrolledAt=dto.created_at,
+        )
+
+
+@dataclass
+class ClassStudentListResp:
+    data: List[ClassStudentResp] = Field(..., title="Data")
+    page: PageResp = Field(..., title="Page")
+
+    @classmethod
+    def from_dto(cls, dto: ClassStudentListDTO) -> "ClassStudentListResp":
+        return cls(
+            data=[ClassStudentResp.from_dto(student) for student in dto.data],
+            page=PageResp.from_dto(dto.page),
+        )
@@ -1,9 +1,10 @@
-from typing import Generic, Optional, TypeVar, Optional
+from typing import Any, Generic, Optional, TypeVar, Optional
 
 from pydantic import BaseModel
 from pydantic.dataclasses import dataclass
 from fastapi.responses import ORJSONResponse
 
+from app.core.timing import SERIALIZE, measure
 from app.models.dtos.common import PageDTO
 
 
@@ -32,12 +33,18 @@ class HttpResponse(ORJSONResponse):
             **kwargs
         )
 
+    def render(self, content: Any) -> bytes:
+        with measure(SERIALIZE):
+            return super().render(content)
+
 
 @dataclass
 class PageResp:
-    total: int
-    page: int
+    total: Optional[int]
+    page: Optional[int]
     limit: int
+    nextCursor: Optional[str] = None
+    totalEstimated: bool = False
 
     @classmethod
     def from_dto(cls, dto: PageDTO) -> "PageResp":
@@ -45,4 +52,6 @@ class PageResp:
             total=dto.total,
             page=dto.page,
             limit=dto.limit,
+            nextCursor=dto.next_cursor,
+            totalEstimated=dto.total_estimated,
         )
@@ -1,10 +1,11 @@
 from uuid import uuid4
 from datetime import datetime
+from typing import List, Optional
 
 from pydantic import BaseModel, Field
 from pydantic.dataclasses import dataclass
 
-from app.models.dtos.user import UserDTO
+from app.models.dtos.user import UserDTO, UserImportDTO, UserImportRejectDTO
 from app.models.constant import UserRole
 
 
@@ -34,3 +35,42 @@ class UserResp:
             userRole=dto.user_role.value,
             createdAt=dto.created_at,
         )
+
+
+class UserImportRow(BaseModel):
+    userId: Optional[str] = Field(None, title="User ID", min_length=1, max_length=255)
+    userName: str = Field(..., title="Username", min_length=1, max_length=255)
+
+    def to_dto(self, user_role: UserRole) -> UserDTO:
+        return UserDTO(
+            user_id=self.userId or uuid4().hex,
+            user_name=self.userName,
+            user_role=user_role,
+        )
+
+
+@dataclass
+class UserImportRejectResp:
+    line: int = Field(..., title="Line")
+    reason: str = Field(..., title="Reason")
+
+    @classmethod
+    def from_dto(cls, dto: UserImportRejectDTO) -> "UserImportRejectResp":
+        return cls(line=dto.line, reason=dto.reason)
+
+
+@dataclass
+class UserImportResp:
+    imported: int = Field(..., title="Imported")
+    rejected: int = Field(..., title="Rejected")
+    rejectedRows: List[UserImportRejectResp] = Field(..., title="Rejected Rows")
+
+    @classmethod
+    def from_dto(cls, dto: UserImportDTO) -> "UserImportResp":
+        return cls(
+            imported=dto.imported,
+            rejected=dto.rejected,
+            rejectedRows=[
+                UserImportRejectResp.from_dto(row) for row in dto.rejected_rows
+            ],
+        )
@@ -1,27 +1,50 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
 
-from sqlalchemy import select, insert, update, delete, func
+from sqlalchemy import (
+    select,
+    insert,
+    update,
+    delete,
+    tuple_,
+    any_,
+    func,
+    literal,
+    String,
+    ColumnElement,
+)
+from sqlalchemy.dialects import postgresql
 
+from app.core.config import config
 from app.core.logger import logger
-from app.core.redis import RedisCacheDecorator
+from app.core.redis import RedisCacheDecorator, RedisCacheInvalidateDecorator
 from app.core.errors import error
-from app.core.db.session import AsyncScopedSession
-from app.models.db.class_ import Class, ClassNotice
-from app.models.dtos.common import PageDTO
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.db.query import count_rows, starts_with, text_search
+from app.core.db.session import AsyncScopedReaderSession
+from app.core.db.uow import unit_of_work
+from app.models.db.class_ import Class, ClassNotice, ClassStudent
+from app.models.db.student import Student
+from app.models.dtos.common import CountDTO, PageDTO
 from app.models.dtos.class_ import (
+    ClassBulkItemDTO,
     ClassDTO,
+    ClassEnrollDTO,
     ClassNoticeDTO,
     ClassListDTO,
     ClassNoticeListDTO,
+    ClassStudentDTO,
+    ClassStudentListDTO,
 )
 
 
 class ClassRepository:
 
+    @RedisCacheInvalidateDecorator(tags=["class_list", "class:{class_id}"])
     async def create_class(
         self, class_id: str, class_name: str, teacher_id: str
     ) -> ClassDTO:
-        async with AsyncScopedSession() as session:
+        async with unit_of_work() as uow:
             try:
                 stmt = (
                     insert(Class)
@@ -33,11 +56,11 @@ class ClassRepository:
                     .returning(Class)
                 )
 
-                result: Class = (await session.execute(stmt)).scalar()
-                await session.commit()
+                result: Class = (await uow.session.execute(stmt)).scalar()
+            except error.DeadlineExceeded:
+                raise
             except Exception as e:
                 logger.error(e)
-                await session.rollback()
                 raise error.ClassCreationFailed()
 
         return ClassDTO(
@@ -47,38 +70,182 @@ class ClassRepository:
             created_at=result.created_at,
         )
 
-    @RedisCacheDecorator()
-    async def read_class_list(self, page: int, limit: int) -> ClassListDTO:
-        async with AsyncScopedSession() as session:
+    @RedisCacheInvalidateDecorator(tags=["class_list"])
+    async def create_classes(self, classes: List[ClassDTO]) -> List[ClassBulkItemDTO]:
+        results = []
+        chunk_size = config.BULK_INSERT_CHUNK_SIZE
+
+        for start in range(0, len(classes), chunk_size):
+            chunk = list(enumerate(classes[start : start + chunk_size], start))
+
+            try:
+                results.extend(await self.insert_class_chunk(chunk))
+            except error.DeadlineExceeded:
+                raise
+            except Exception as e:
+                logger.error(e)
+                results.extend(await self.insert_class_rows(chunk))
+
+        return results
+
+    async def insert_class_chunk(
+        self, chunk: List[Tuple[int, ClassDTO]]
+    ) -> List[ClassBulkItemDTO]:
+        async with unit_of_work() as uow:
             stmt = (
-                select(Class, func.count().over().label("total"))
-                .limit(limit)
-                .offset((page - 1) * limit if page > 1 else 0)
-                .order_by(Class.created_at.desc())
+                postgresql.insert(Class)
+                .values(
+                    [
+                        dict(
+                            class_id=class_.class_id,
+                            class_name=class_.class_name,
+                            teacher_id=class_.teacher_id,
+                        )
+                        for _, class_ in chunk
+                    ]
+                )
+                .on_conflict_do_nothing(index_elements=[Class.class_id])
+                .returning(Class)
             )
 
-            results: List[List[Class, int]] = (await session.execute(stmt)).all()
+            rows = (await uow.session.execute(stmt)).scalars().all()
+
+        created = {row.class_id: row for row in rows}
+
+        return [
+            self.to_bulk_item(index, created.get(class_.class_id))
+            for index, class_ in chunk
+        ]
+
+    async def insert_class_rows(
+        self, chunk: List[Tuple[int, ClassDTO]]
+    ) -> List[ClassBulkItemDTO]:
+        results = []
+
+        async with unit_of_work() as uow:
+            for index, class_ in chunk:
+                try:
+                    async with uow.session.begin_nested():
+                        stmt = (
+                            insert(Class)
+                            .values(
+                                class_id=class_.class_id,
+                                class_name=class_.class_name,
+                                teacher_id=class_.teacher_id,
+                            )
+                            .returning(Class)
+                        )
+
+                        result: Class = (await uow.session.execute(stmt)).scalar()
+                except error.DeadlineExceeded:
+                    raise
+                except Exception as e:
+                    logger.error(e)
+                    result = None
+
+                results.append(self.to_bulk_item(index, result))
+
+        return results
+
+    def to_bulk_item(self, index: int, result: Optional[Class]) -> ClassBulkItemDTO:
+        if result is None:
+            failure = error.ClassCreationFailed()
+            return ClassBulkItemDTO(
+                index=index, error_code=failure.code, error_message=failure.message
+            )
+
+        return ClassBulkItemDTO(
+            index=index,
+            data=ClassDTO(
+                class_id=result.class_id,
+                class_name=result.class_name,
+                teacher_id=result.teacher_id,
+                created_at=result.created_at,
+            ),
+        )
+
+    @RedisCacheDecorator(ttl=3600, hard_ttl=86400, tags=["class_list"])
+    async def read_class_list(
+        self,
+        page: int,
+        limit: int,
+        cursor: Optional[str] = None,
+        with_total: bool = True,
+        teacher_id: Optional[str] = None,
+        name_prefix: Optional[str] = None,
+    ) -> ClassListDTO:
+        async with AsyncScopedReaderSession() as session:
+            stmt = (
+                select(Class)
+                .where(*self.class_filters(teacher_id, name_prefix))
+                .limit(limit + 1)
+                .order_by(Class.created_at.desc(), Class.class_id.desc())
+            )
+
+            if cursor:
+                created_at, class_id = decode_cursor(cursor, datetime, str)
+                stmt = stmt.where(
+                    tuple_(Class.created_at, Class.class_id) < (created_at, class_id)
+                )
+            else:
+                stmt = stmt.offset((page - 1) * limit if page > 1 else 0)
+
+            results = (await session.execute(stmt)).scalars().all()
 
         data = []
-        page = PageDTO(page=page, limit=limit, total=0)
-
-        if results:
-            for row, total in results:
-                data.append(
-                    ClassDTO(
-                        class_id=row.class_id,
-                        class_name=row.class_name,
-                        teacher_id=row.teacher_id,
-                        created_at=row.created_at,
-                    )
+        page = PageDTO(page=None if cursor else page, limit=limit, total=None)
+
+        for row in results[:limit]:
+            data.append(
+                ClassDTO(
+                    class_id=row.class_id,
+                    class_name=row.class_name,
+                    teacher_id=row.teacher_id,
+                    created_at=row.created_at,
                 )
-            page.total = total
+            )
+
+        if len(results) > limit:
+            page.next_cursor = encode_cursor(data[-1].created_at, data[-1].class_id)
+
+        if with_total:
+            count = await self.count_class(
+                teacher_id=teacher_id, name_prefix=name_prefix
+            )
+            page.total, page.total_estimated = count.total, count.estimated
 
         return ClassListDTO(data=data, page=page)
 
-    @RedisCacheDecorator()
+    @RedisCacheDecorator(ttl=3600, hard_ttl=86400, tags=["class_list"])
+    async def count_class(
+        self, teacher_id: Optional[str] = None, name_prefix: Optional[str] = None
+    ) -> CountDTO:
+        async with AsyncScopedReaderSession() as session:
+            total, estimated = await count_rows(
+                session,
+                select(Class.class_id).where(
+                    *self.class_filters(teacher_id, name_prefix)
+                ),
+                estimate_threshold=config.PAGE_TOTAL_ESTIMATE_THRESHOLD,
+            )
+
+        return CountDTO(total=total, estimated=estimated)
+
+    def class_filters(
+        self, teacher_id: Optional[str], name_prefix: Optional[str]
+    ) -> List[ColumnElement]:
+        filters = []
+
+        if teacher_id is not None:
+            filters.append(Class.teacher_id == teacher_id)
+        if name_prefix:
+            filters.append(starts_with(Class.class_name, name_prefix))
+
+        return filters
+
+    @RedisCacheDecorator(ttl=3600, hard_ttl=86400, tags=["class:{class_id}"])
     async def read_class(self, class_id: str) -> Optional[ClassDTO]:
-        async with AsyncScopedSession() as session:
+        async with AsyncScopedReaderSession() as session:
             stmt = select(Class).where(Class.class_id == class_id)
 
             result = (await session.execute(stmt)).scalar()
@@ -93,8 +260,9 @@ class ClassRepository:
         else:
             return None
 
+    @RedisCacheInvalidateDecorator(tags=["class_notice:{class_id}"])
     async def create_class_notice(self, class_id: str, message: str) -> ClassNoticeDTO:
-        async with AsyncScopedSession() as session:
+        async with unit_of_work() as uow:
             try:
                 stmt = (
                     insert(ClassNotice)
@@ -105,11 +273,11 @@ class ClassRepository:
                     .returning(ClassNotice)
                 )
 
-                result: ClassNotice = (await session.execute(stmt)).scalar()
-                await session.commit()
+                result: ClassNotice = (await uow.session.execute(stmt)).scalar()
+            except error.DeadlineExceeded:
+                raise
             except Exception as e:
                 logger.error(e)
-                await session.rollback()
                 raise error.ClassNoticeCreationFailed()
 
         return ClassNoticeDTO(
@@ -120,43 +288,187 @@ class ClassRepository:
             updated_at=result.updated_at,
         )
 
-    @RedisCacheDecorator()
+    @RedisCacheInvalidateDecorator(
+        tags=[],
+        result_tags=lambda notices: {
+            f"class_notice:{notice.class_id}" for notice in notices
+        },
+    )
+    async def create_class_notices(
+        self,
+        message: str,
+        class_ids: Optional[List[str]] = None,
+        teacher_id: Optional[str] = None,
+    ) -> List[ClassNoticeDTO]:
+        async with unit_of_work() as uow:
+            try:
+                classes = select(Class.class_id, literal(message), func.now()).order_by(
+                    Class.class_id
+                )
+
+                if class_ids is not None:
+                    classes = classes.where(
+                        Class.class_id
+                        == any_(literal(list(set(class_ids)), postgresql.ARRAY(String)))
+                    )
+                else:
+                    classes = classes.where(Class.teacher_id == teacher_id)
+
+                stmt = (
+                    insert(ClassNotice)
+                    .from_select(
+                        [
+                            ClassNotice.class_id,
+                            ClassNotice.message,
+                            ClassNotice.created_at,
+                        ],
+                        classes,
+                    )
+                    .returning(ClassNotice)
+                )
+
+                results = (await uow.session.execute(stmt)).scalars().all()
+            except error.DeadlineExceeded:
+                raise
+            except Exception as e:
+                logger.error(e)
+                raise error.ClassNoticeCreationFailed()
+
+        return [
+            ClassNoticeDTO(
+                notice_id=result.id,
+                class_id=result.class_id,
+                message=result.message,
+                created_at=result.created_at,
+                updated_at=result.updated_at,
+            )
+            for result in results
+        ]
+
+    @RedisCacheDecorator(ttl=3600, hard_ttl=86400, tags=["class_notice:{class_id}"])
     async def read_class_notice_list(
-        self, class_id: str, page: int, limit: int
+        self,
+        class_id: str,
+        page: int,
+        limit: int,
+        cursor: Optional[str] = None,
+        with_total: bool = True,
     ) -> ClassNoticeListDTO:
-        async with AsyncScopedSession() as session:
+        async with AsyncScopedReaderSession() as session:
             stmt = (
-                select(ClassNotice, func.count().over().label("total"))
+                select(ClassNotice)
                 .where(ClassNotice.class_id == class_id)
-                .limit(limit)
-                .offset((page - 1) * limit if page > 1 else 0)
-                .order_by(ClassNotice.created_at.desc())
+                .limit(limit + 1)
+                .order_by(ClassNotice.created_at.desc(), ClassNotice.id.desc())
             )
 
-            results: List[List[ClassNotice, int]] = (await session.execute(stmt)).all()
+            if cursor:
+                created_at, notice_id = decode_cursor(cursor, datetime, int)
+                stmt = stmt.where(
+                    tuple_(ClassNotice.created_at, ClassNotice.id)
+                    < (created_at, notice_id)
+                )
+            else:
+                stmt = stmt.offset((page - 1) * limit if page > 1 else 0)
+
+            results = (await session.execute(stmt)).scalars().all()
 
         data = []
-        page = PageDTO(page=page, limit=limit, total=0)
-
-        if results:
-            for row, total in results:
-                data.append(
-                    ClassNoticeDTO(
-                        notice_id=row.id,
-                        class_id=row.class_id,
-                        message=row.message,
-                        created_at=row.created_at,
-                        updated_at=row.updated_at,
-                    )
+        page = PageDTO(page=None if cursor else page, limit=limit, total=None)
+
+        for row in results[:limit]:
+            data.append(
+                ClassNoticeDTO(
+                    notice_id=row.id,
+                    class_id=row.class_id,
+                    message=row.message,
+                    created_at=row.created_at,
+                    updated_at=row.updated_at,
                 )
-            page.total = total
+            )
+
+        if len(results) > limit:
+            page.next_cursor = encode_cursor(data[-1].created_at, data[-1].notice_id)
+
+        if with_total:
+            count = await self.count_class_notice(class_id=class_id)
+            page.total, page.total_estimated = count.total, count.estimated
 
         return ClassNoticeListDTO(data=data, page=page)
 
+    @RedisCacheDecorator(ttl=3600, hard_ttl=86400, tags=["class_notice:{class_id}"])
+    async def count_class_notice(self, class_id: str) -> CountDTO:
+        async with AsyncScopedReaderSession() as session:
+            total, estimated = await count_rows(
+                session,
+                select(ClassNotice.id).where(ClassNotice.class_id == class_id),
+                estimate_threshold=config.PAGE_TOTAL_ESTIMATE_THRESHOLD,
+            )
+
+        return CountDTO(total=total, estimated=estimated)
+
+    @RedisCacheDecorator(ttl=config.SEARCH_CACHE_TTL, tags=["class_notice:{class_id}"])
+    async def search_class_notices(
+        self,
+        q: str,
+        limit: int,
+        class_id: Optional[str] = None,
+        cursor: Optional[str] = None,
+    ) -> ClassNoticeListDTO:
+        match, rank = text_search(ClassNotice.message, q)
+
+        ranked = select(
+            ClassNotice.id,
+            ClassNotice.class_id,
+            ClassNotice.message,
+            ClassNotice.created_at,
+            ClassNotice.updated_at,
+            rank.label("rank"),
+        ).where(match)
+        if class_id:
+            ranked = ranked.where(ClassNotice.class_id == class_id)
+        ranked = ranked.subquery()
+
+        stmt = (
+            select(ranked)
+            .order_by(ranked.c.rank.desc(), ranked.c.id.desc())
+            .limit(limit + 1)
+        )
+
+        if cursor:
+            rank_value, notice_id = decode_cursor(cursor, float, int)
+            stmt = stmt.where(
+                tuple_(ranked.c.rank, ranked.c.id)
+                < (literal(rank_value, postgresql.REAL), notice_id)
+            )
+
+        async with AsyncScopedReaderSession() as session:
+            results = (await session.execute(stmt)).all()
+
+        data = [
+            ClassNoticeDTO(
+                notice_id=row.id,
+                class_id=row.class_id,
+                message=row.message,
+                created_at=row.created_at,
+                updated_at=row.updated_at,
+            )
+            for row in results[:limit]
+        ]
+        page = PageDTO(page=None, limit=limit, total=None)
+
+        if len(results) > limit:
+            page.next_cursor = encode_cursor(
+                results[limit - 1].rank, data[-1].notice_id
+            )
+
+        return ClassNoticeListDTO(data=data, page=page)
+
+    @RedisCacheInvalidateDecorator(tags=["class_notice:{class_id}"])
     async def update_class_notice(
         self, class_id: str, notice_id: int, message: str
     ) -> Optional[ClassNoticeDTO]:
-        async with AsyncScopedSession() as session:
+        async with unit_of_work() as uow:
             try:
                 stmt = (
                     update(ClassNotice)
@@ -167,11 +479,11 @@ class ClassRepository:
                     .returning(ClassNotice)
                 )
 
-                result: ClassNotice = (await session.execute(stmt)).scalar()
-                await session.commit()
+                result: ClassNotice = (await uow.session.execute(stmt)).scalar()
+            except error.DeadlineExceeded:
+                raise
             except Exception as e:
                 logger.error(e)
-                await session.rollback()
                 raise error.ClassNoticeUpdateFailed()
 
         if result:
@@ -185,10 +497,11 @@ class ClassRepository:
         else:
             return None
 
+    @RedisCacheInvalidateDecorator(tags=["class_notice:{class_id}"])
     async def delete_class_notice(
         self, class_id: str, notice_id: int
     ) -> Optional[ClassNoticeDTO]:
-        async with AsyncScopedSession() as session:
+        async with unit_of_work() as uow:
             try:
                 stmt = (
                     delete(ClassNotice)
@@ -197,11 +510,11 @@ class ClassRepository:
                     )
                     .returning(ClassNotice)
                 )
-                result: ClassNotice = (await session.execute(stmt)).scalar()
-                await session.commit()
+                result: ClassNotice = (await uow.session.execute(stmt)).scalar()
+            except error.DeadlineExceeded:
+                raise
             except Exception as e:
                 logger.error(e)
-                await session.rollback()
                 raise error.ClassNoticeDeleteFailed()
 
         if result:
@@ -215,3 +528,127 @@ class ClassRepository:
             )
         else:
             return None
+
+    @RedisCacheInvalidateDecorator(tags=["class_student:{class_id}"])
+    async def enroll_students(
+        self, class_id: str, student_ids: List[str]
+    ) -> ClassEnrollDTO:
+        student_ids = list(dict.fromkeys(student_ids))
+        chunk_size = config.BULK_INSERT_CHUNK_SIZE
+        found, enrolled = set(), set()
+
+        async with unit_of_work() as uow:
+            try:
+                for start in range(0, len(student_ids), chunk_size):
+                    chunk = student_ids[start : start + chunk_size]
+
+                    students = (
+                        select(Student.student_id)
+                        .where(
+                            Student.student_id
+                            == any_(literal(chunk, postgresql.ARRAY(String)))
+                        )
+                        .cte("students")
+                    )
+                    inserted = (
+                        postgresql.insert(ClassStudent)
+                        .from_select(
+                            [
+                                ClassStudent.class_id,
+                                ClassStudent.student_id,
+                                ClassStudent.created_at,
+                            ],
+                            select(
+                                literal(class_id, String),
+                                students.c.student_id,
+                                func.now(),
+                            ),
+                        )
+                        .on_conflict_do_nothing()
+                        .returning(ClassStudent.student_id)
+                        .cte("inserted")
+                    )
+                    stmt = select(
+                        students.c.student_id, inserted.c.student_id.is_not(None)
+                    ).outerjoin(
+                        inserted, inserted.c.student_id == students.c.student_id
+                    )
+
+                    for student_id, created in (await uow.session.execute(stmt)).all():
+                        found.add(student_id)
+                        if created:
+                            enrolled.add(student_id)
+
+            except error.DeadlineExceeded:
+                raise
+            except Exception as e:
+                logger.error(e)
+                raise error.ClassStudentEnrollFailed()
+
+        return ClassEnrollDTO(
+            enrolled=[id_ for id_ in student_ids if id_ in enrolled],
+            already_enrolled=[
+                id_ for id_ in student_ids if id_ in found and id_ not in enrolled
+            ],
+            not_found=[id_ for id_ in student_ids if id_ not in found],
+        )
+
+    @RedisCacheDecorator(ttl=3600, hard_ttl=86400, tags=["class_student:{class_id}"])
+    async def read_class_student_list(
+        self,
+        class_id: str,
+        limit: int,
+        cursor: Optional[str] = None,
+        with_total: bool = True,
+    ) -> ClassStudentListDTO:
+        async with AsyncScopedReaderSession() as session:
+            stmt = (
+                select(
+                    ClassStudent.student_id,
+                    Student.student_name,
+                    ClassStudent.created_at,
+                )
+                .join(Student, Student.student_id == ClassStudent.student_id)
+                .where(ClassStudent.class_id == class_id)
+                .order_by(ClassStudent.student_id)
+                .limit(limit + 1)
+            )
+
+            if cursor:
+                (student_id,) = decode_cursor(cursor, str)
+                stmt = stmt.where(ClassStudent.student_id > student_id)
+
+            results = (await session.execute(stmt)).all()
+
+        data = [
+            ClassStudentDTO(
+                class_id=class_id,
+                student_id=row.student_id,
+                student_name=row.student_name,
+                created_at=row.created_at,
+            )
+            for row in results[:limit]
+        ]
+        page = PageDTO(page=None, limit=limit, total=None)
+
+        if len(results) > limit:
+            page.next_cursor = encode_cursor(data[-1].student_id)
+
+        if with_total:
+            count = await self.count_class_student(class_id=class_id)
+            page.total, page.total_estimated = count.total, count.estimated
+
+        return ClassStudentListDTO(data=data, page=page)
+
+    @RedisCacheDecorator(ttl=3600, hard_ttl=86400, tags=["class_student:{class_id}"])
+    async def count_class_student(self, class_id: str) -> CountDTO:
+        async with AsyncScopedReaderSession() as session:
+            total, estimated = await count_rows(
+                session,
+                select(ClassStudent.student_id).where(
+                    ClassStudent.class_id == class_id
+                ),
+                estimate_threshold=config.PAGE_TOTAL_ESTIMATE_THRESHOLD,
+            )
+
+        return CountDTO(total=total, estimated=estimated)
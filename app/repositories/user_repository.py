@@ -1,20 +1,29 @@
-from sqlalchemy import insert
+from datetime import datetime, timezone
+from typing import List, Set
+
+from sqlalchemy import insert, text
 
 from app.core.logger import logger
 from app.core.errors import error
-from app.core.db.session import AsyncScopedSession
+from app.core.db.uow import unit_of_work
 from app.models.db.student import Student
 from app.models.db.teacher import Teacher
 from app.models.dtos.user import UserDTO
 from app.models.constant import UserRole
 
 
+USER_TABLES = {
+    UserRole.STUDENT: ("student", "student_id", "student_name"),
+    UserRole.TEACHER: ("teacher", "teacher_id", "teacher_name"),
+}
+
+
 class UserRepository:
 
     async def create_student_user(
         self, user_id: str, user_name: str, user_role: UserRole
     ) -> UserDTO:
-        async with AsyncScopedSession() as session:
+        async with unit_of_work() as uow:
             try:
                 stmt = (
                     insert(Student)
@@ -25,11 +34,11 @@ class UserRepository:
                     .returning(Student)
                 )
 
-                result: Student = (await session.execute(stmt)).scalar()
-                await session.commit()
+                result: Student = (await uow.session.execute(stmt)).scalar()
+            except error.DeadlineExceeded:
+                raise
             except Exception as e:
                 logger.error(e)
-                await session.rollback()
                 raise error.UserCreationFailed()
 
         return UserDTO(
@@ -42,7 +51,7 @@ class UserRepository:
     async def create_teacher_user(
         self, user_id: str, user_name: str, user_role: UserRole
     ) -> UserDTO:
-        async with AsyncScopedSession() as session:
+        async with unit_of_work() as uow:
             try:
                 stmt = (
                     insert(Teacher)
@@ -53,11 +62,11 @@ class UserRepository:
                     .returning(Teacher)
                 )
 
-                result: Teacher = (await session.execute(stmt)).scalar()
-                await session.commit()
+                result: Teacher = (await uow.session.execute(stmt)).scalar()
+            except error.DeadlineExceeded:
+                raise
             except Exception as e:
                 logger.error(e)
-                await session.rollback()
                 raise error.UserCreationFailed()
 
         return UserDTO(
@@ -66,3 +75,39 @@ class UserRepository:
             user_role=user_role,
             created_at=result.created_at,
         )
+
+    async def copy_users(self, user_role: UserRole, users: List[UserDTO]) -> Set[str]:
+        table, id_column, name_column = USER_TABLES[user_role]
+        staging = f"{table}_import"
+        created_at = datetime.now(timezone.utc)
+
+        async with unit_of_work() as uow:
+            try:
+                await uow.session.execute(
+                    text(f"CREATE TEMP TABLE {staging} (LIKE {table})")
+                )
+
+                connection = await (await uow.session.connection()).get_raw_connection()
+                await connection.driver_connection.copy_records_to_table(
+                    staging,
+                    records=[
+                        (user.user_id, user.user_name, created_at) for user in users
+                    ],
+                    columns=[id_column, name_column, "created_at"],
+                )
+
+                stmt = text(
+                    f"INSERT INTO {table} ({id_column}, {name_column}, created_at) "
+                    f"SELECT {id_column}, {name_column}, created_at FROM {staging} "
+                    f"ON CONFLICT DO NOTHING RETURNING {id_column}"
+                )
+
+                result = set((await uow.session.execute(stmt)).scalars().all())
+                await uow.session.execute(text(f"DROP TABLE {staging}"))
+            except error.DeadlineExceeded:
+                raise
+            except Exception as e:
+                logger.error(e)
+                raise error.UserCreationFailed()
+
+        return result
@@ -1,16 +1,26 @@
-from fastapi import APIRouter, Depends
+from typing import List, Optional
+
+from fastapi import APIRouter, Body, Depends, Query
 from dependency_injector.wiring import Provide, inject
 
 from app import services
+from app.core.config import config
 from app.core.container import Container
+from app.core.deadline import RequestDeadline
 from app.models.schemas.common import BaseResponse, HttpResponse, ErrorResponse
 from app.models.schemas.class_ import (
+    ClassBulkResp,
+    ClassEnrollReq,
+    ClassEnrollResp,
     ClassReq,
     ClassResp,
     ClassListResp,
+    ClassNoticeBroadcastReq,
+    ClassNoticeBroadcastResp,
     ClassNoticeReq,
     ClassNoticeResp,
     ClassNoticeListResp,
+    ClassStudentListResp,
 )
 
 router = APIRouter()
@@ -31,6 +41,26 @@ async def create_class(
     return HttpResponse(content=ClassResp.from_dto(result))
 
 
+@router.post(
+    "/bulk",
+    response_model=BaseResponse[ClassBulkResp],
+    responses={400: {"model": ErrorResponse}},
+    dependencies=[Depends(RequestDeadline(config.BULK_REQUEST_TIMEOUT))],
+)
+@inject
+async def create_classes(
+    request_body: List[ClassReq] = Body(
+        ..., min_length=1, max_length=config.BULK_MAX_ITEMS
+    ),
+    class_service: services.ClassService = Depends(Provide[Container.class_service]),
+) -> BaseResponse[ClassBulkResp]:
+    result = await class_service.create_classes(
+        [class_req.to_dto() for class_req in request_body]
+    )
+
+    return HttpResponse(content=ClassBulkResp.from_dto(result))
+
+
 @router.get(
     "/list",
     response_model=BaseResponse[ClassListResp],
@@ -39,10 +69,16 @@ async def create_class(
 @inject
 async def read_class_list(
     page: int = 1,
-    limit: int = 10,
+    limit: int = Query(10, ge=1, le=config.PAGE_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    withTotal: bool = True,
+    teacherId: Optional[str] = None,
+    namePrefix: Optional[str] = None,
     class_service: services.ClassService = Depends(Provide[Container.class_service]),
 ) -> BaseResponse[ClassListResp]:
-    result = await class_service.read_class_list(page, limit)
+    result = await class_service.read_class_list(
+        page, limit, cursor, withTotal, teacherId, namePrefix
+    )
 
     return HttpResponse(content=ClassListResp.from_dto(result))
 
@@ -62,6 +98,40 @@ async def read_class(
     return HttpResponse(content=ClassResp.from_dto(result))
 
 
+@router.post(
+    "/notice/broadcast",
+    response_model=BaseResponse[ClassNoticeBroadcastResp],
+    responses={400: {"model": ErrorResponse}},
+    dependencies=[Depends(RequestDeadline(config.BULK_REQUEST_TIMEOUT))],
+)
+@inject
+async def broadcast_class_notice(
+    request_body: ClassNoticeBroadcastReq,
+    class_service: services.ClassService = Depends(Provide[Container.class_service]),
+) -> BaseResponse[ClassNoticeBroadcastResp]:
+    result = await class_service.broadcast_class_notice(request_body.to_dto())
+
+    return HttpResponse(content=ClassNoticeBroadcastResp.from_dto(result))
+
+
+@router.get(
+    "/notice/search",
+    response_model=BaseResponse[ClassNoticeListResp],
+    responses={400: {"model": ErrorResponse}},
+)
+@inject
+async def search_class_notices(
+    q: str = Query(..., min_length=1, max_length=config.SEARCH_MAX_QUERY_LENGTH),
+    classId: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=config.PAGE_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    class_service: services.ClassService = Depends(Provide[Container.class_service]),
+) -> BaseResponse[ClassNoticeListResp]:
+    result = await class_service.search_class_notices(q, limit, classId, cursor)
+
+    return HttpResponse(content=ClassNoticeListResp.from_dto(result))
+
+
 @router.post(
     "/notice/{class_id}",
     response_model=BaseResponse[ClassNoticeResp],
@@ -87,10 +157,14 @@ async def create_class_notice(
 async def read_class_notice_list(
     class_id: str,
     page: int = 1,
-    limit: int = 10,
+    limit: int = Query(10, ge=1, le=config.PAGE_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    withTotal: bool = True,
     class_service: services.ClassService = Depends(Provide[Container.class_service]),
 ) -> BaseResponse[ClassNoticeListResp]:
-    result = await class_service.read_class_notice_list(class_id, page, limit)
+    result = await class_service.read_class_notice_list(
+        class_id, page, limit, cursor, withTotal
+    )
 
     return HttpResponse(content=ClassNoticeListResp.from_dto(result))
 
@@ -128,3 +202,40 @@ async def delete_class_notice(
     result = await class_service.delete_class_notice(class_id, notice_id)
 
     return HttpResponse(content=ClassNoticeResp.from_dto(result))
+
+
+@router.post(
+    "/{class_id}/students",
+    response_model=BaseResponse[ClassEnrollResp],
+    responses={400: {"model": ErrorResponse}},
+    dependencies=[Depends(RequestDeadline(config.BULK_REQUEST_TIMEOUT))],
+)
+@inject
+async def enroll_students(
+    class_id: str,
+    request_body: ClassEnrollReq,
+    class_service: services.ClassService = Depends(Provide[Container.class_service]),
+) -> BaseResponse[ClassEnrollResp]:
+    result = await class_service.enroll_students(class_id, request_body.studentIds)
+
+    return HttpResponse(content=ClassEnrollResp.from_dto(result))
+
+
+@router.get(
+    "/{class_id}/students",
+    response_model=BaseResponse[ClassStudentListResp],
+    responses={400: {"model": ErrorResponse}},
+)
+@inject
+async def read_class_student_list(
+    class_id: str,
+    limit: int = Query(100, ge=1, le=config.PAGE_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    withTotal: bool = True,
+    class_service: services.ClassService = Depends(Provide[Container.class_service]),
+) -> BaseResponse[ClassStudentListResp]:
+    result = await class_service.read_class_student_list(
+        class_id, limit, cursor, withTotal
+    )
+
+    return HttpResponse(content=ClassStudentListResp.from_dto(result))
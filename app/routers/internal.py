@@ -0,0 +1,32 @@
+from typing import Any, Dict
+
+from fastapi import APIRouter
+
+from app.core.db.session import pool_stats
+from app.core.metrics import cache_metrics
+from app.core.redis import redis_cache
+from app.models.schemas.common import BaseResponse, HttpResponse
+
+router = APIRouter()
+
+
+@router.get(
+    "/cache/metrics",
+    response_model=BaseResponse[Dict[str, Any]],
+)
+async def read_cache_metrics() -> BaseResponse[Dict[str, Any]]:
+    return HttpResponse(
+        content={
+            "functions": cache_metrics.snapshot(),
+            "local": redis_cache.local.stats() if redis_cache.local else None,
+            "circuitBreaker": redis_cache.breaker.stats(),
+        }
+    )
+
+
+@router.get(
+    "/db/pool",
+    response_model=BaseResponse[Dict[str, Any]],
+)
+async def read_db_pool_stats() -> BaseResponse[Dict[str, Any]]:
+    return HttpResponse(content=pool_stats())
@@ -1,15 +1,45 @@
-from fastapi import APIRouter, Depends
+from typing import AsyncIterator, Tuple, Union
+
+from fastapi import APIRouter, Depends, Request
+from pydantic import ValidationError
 from dependency_injector.wiring import Provide, inject
 
 from app import services
+from app.core.config import config
 from app.core.container import Container
+from app.core.deadline import RequestDeadline
+from app.core.streaming import get_format, iter_records
 from app.models.constant import UserRole
 from app.models.schemas.common import BaseResponse, HttpResponse, ErrorResponse
-from app.models.schemas.user import UserReq, UserResp
+from app.models.dtos.user import UserDTO
+from app.models.schemas.user import UserImportResp, UserImportRow, UserReq, UserResp
 
 router = APIRouter()
 
 
+async def parse_import_rows(
+    request: Request, format_: str, user_role: UserRole
+) -> AsyncIterator[Tuple[int, Union[UserDTO, str]]]:
+    records = iter_records(
+        request.stream(), format_, max_line_length=config.IMPORT_MAX_LINE_LENGTH
+    )
+
+    async for line, record in records:
+        if isinstance(record, str):
+            yield line, record
+            continue
+
+        try:
+            row = UserImportRow.model_validate(record)
+        except ValidationError as e:
+            yield line, "; ".join(
+                f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()
+            )
+            continue
+
+        yield line, row.to_dto(user_role)
+
+
 @router.post(
     "/teacher",
     response_model=BaseResponse[UserResp],
@@ -42,3 +72,24 @@ async def create_student(
     )
 
     return HttpResponse(content=UserResp.from_dto(result))
+
+
+@router.post(
+    "/{user_role}/import",
+    response_model=BaseResponse[UserImportResp],
+    responses={400: {"model": ErrorResponse}},
+    dependencies=[Depends(RequestDeadline(config.IMPORT_REQUEST_TIMEOUT))],
+)
+@inject
+async def import_users(
+    user_role: UserRole,
+    request: Request,
+    user_service: services.UserService = Depends(Provide[Container.user_service]),
+) -> BaseResponse[UserImportResp]:
+    format_ = get_format(request.headers.get("content-type"))
+
+    result = await user_service.import_users(
+        user_role, parse_import_rows(request, format_, user_role)
+    )
+
+    return HttpResponse(content=UserImportResp.from_dto(result))
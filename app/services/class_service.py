@@ -1,29 +1,57 @@
-from typing import List
+from typing import List, Optional
 
 from app import repositories
+from app.core.db.uow import unit_of_work
+from app.core.timing import SERVICE, timed
 from app.models.dtos.class_ import (
+    ClassBulkItemDTO,
     ClassDTO,
+    ClassEnrollDTO,
+    ClassNoticeBroadcastDTO,
     ClassNoticeDTO,
     ClassListDTO,
     ClassNoticeListDTO,
+    ClassStudentListDTO,
 )
 from app.core.errors import error
 
 
+@timed(SERVICE)
 class ClassService:
     def __init__(self, class_repository: repositories.ClassRepository):
         self.class_repository = class_repository
 
     async def create_class(self, class_dto: ClassDTO) -> ClassDTO:
-        return await self.class_repository.create_class(
-            class_id=class_dto.class_id,
-            class_name=class_dto.class_name,
-            teacher_id=class_dto.teacher_id,
+        async with unit_of_work():
+            return await self.class_repository.create_class(
+                class_id=class_dto.class_id,
+                class_name=class_dto.class_name,
+                teacher_id=class_dto.teacher_id,
+            )
+
+    async def create_classes(
+        self, class_dtos: List[ClassDTO]
+    ) -> List[ClassBulkItemDTO]:
+        return await self.class_repository.create_classes(classes=class_dtos)
+
+    async def read_class_list(
+        self,
+        page: int,
+        limit: int,
+        cursor: Optional[str] = None,
+        with_total: bool = True,
+        teacher_id: Optional[str] = None,
+        name_prefix: Optional[str] = None,
+    ) -> ClassListDTO:
+        return await self.class_repository.read_class_list(
+            page=page,
+            limit=limit,
+            cursor=cursor,
+            with_total=with_total,
+            teacher_id=teacher_id,
+            name_prefix=name_prefix,
         )
 
-    async def read_class_list(self, page: int, limit: int) -> ClassListDTO:
-        return await self.class_repository.read_class_list(page=page, limit=limit)
-
     async def read_class(self, class_id: str) -> ClassDTO:
         result = await self.class_repository.read_class(class_id=class_id)
 
@@ -35,25 +63,57 @@ class ClassService:
     async def create_class_notice(
         self, class_notice_dto: ClassNoticeDTO
     ) -> ClassNoticeDTO:
-        return await self.class_repository.create_class_notice(
-            class_id=class_notice_dto.class_id, message=class_notice_dto.message
-        )
+        async with unit_of_work():
+            return await self.class_repository.create_class_notice(
+                class_id=class_notice_dto.class_id, message=class_notice_dto.message
+            )
+
+    async def broadcast_class_notice(
+        self, broadcast_dto: ClassNoticeBroadcastDTO
+    ) -> List[ClassNoticeDTO]:
+        async with unit_of_work():
+            return await self.class_repository.create_class_notices(
+                message=broadcast_dto.message,
+                class_ids=broadcast_dto.class_ids,
+                teacher_id=broadcast_dto.teacher_id,
+            )
 
     async def read_class_notice_list(
-        self, class_id: str, page: int, limit: int
+        self,
+        class_id: str,
+        page: int,
+        limit: int,
+        cursor: Optional[str] = None,
+        with_total: bool = True,
     ) -> ClassNoticeListDTO:
         return await self.class_repository.read_class_notice_list(
-            class_id=class_id, page=page, limit=limit
+            class_id=class_id,
+            page=page,
+            limit=limit,
+            cursor=cursor,
+            with_total=with_total,
+        )
+
+    async def search_class_notices(
+        self,
+        q: str,
+        limit: int,
+        class_id: Optional[str] = None,
+        cursor: Optional[str] = None,
+    ) -> ClassNoticeListDTO:
+        return await self.class_repository.search_class_notices(
+            q=" ".join(q.split()), limit=limit, class_id=class_id, cursor=cursor
         )
 
     async def update_class_notice(
         self, class_notice_dto: ClassNoticeDTO
     ) -> ClassNoticeDTO:
-        result = await self.class_repository.update_class_notice(
-            class_id=class_notice_dto.class_id,
-            notice_id=class_notice_dto.notice_id,
-            message=class_notice_dto.message,
-        )
+        async with unit_of_work():
+            result = await self.class_repository.update_class_notice(
+                class_id=class_notice_dto.class_id,
+                notice_id=class_notice_dto.notice_id,
+                message=class_notice_dto.message,
+            )
 
         if not result:
             raise error.ClassNoticeNotFound()
@@ -63,11 +123,33 @@ class ClassService:
     async def delete_class_notice(
         self, class_id: str, notice_id: int
     ) -> ClassNoticeDTO:
-        result = await self.class_repository.delete_class_notice(
-            class_id=class_id, notice_id=notice_id
-        )
+        async with unit_of_work():
+            result = await self.class_repository.delete_class_notice(
+                class_id=class_id, notice_id=notice_id
+            )
 
         if not result:
             raise error.ClassNoticeNotFound()
 
         return result
+
+    async def enroll_students(
+        self, class_id: str, student_ids: List[str]
+    ) -> ClassEnrollDTO:
+        async with unit_of_work():
+            await self.read_class(class_id)
+
+            return await self.class_repository.enroll_students(
+                class_id=class_id, student_ids=student_ids
+            )
+
+    async def read_class_student_list(
+        self,
+        class_id: str,
+        limit: int,
+        cursor: Optional[str] = None,
+        with_total: bool = True,
+    ) -> ClassStudentListDTO:
+        return await self.class_repository.read_class_student_list(
+            class_id=class_id, limit=limit, cursor=cursor, with_total=with_total
+        )
@@ -1,21 +1,84 @@
+from typing import AsyncIterator, List, Tuple, Union
+
 from app import repositories
-from app.models.dtos.user import UserDTO
+from app.core.config import config
+from app.core.db.uow import unit_of_work
+from app.core.timing import SERVICE, timed
+from app.core.errors.error import BaseAPIException, DeadlineExceeded
+from app.models.constant import UserRole
+from app.models.dtos.user import UserDTO, UserImportDTO, UserImportRejectDTO
 
 
+@timed(SERVICE)
 class UserService:
     def __init__(self, user_repository: repositories.UserRepository):
         self.user_repository = user_repository
 
     async def create_student_user(self, user_dto: UserDTO) -> UserDTO:
-        return await self.user_repository.create_student_user(
-            user_id=user_dto.user_id,
-            user_name=user_dto.user_name,
-            user_role=user_dto.user_role,
-        )
+        async with unit_of_work():
+            return await self.user_repository.create_student_user(
+                user_id=user_dto.user_id,
+                user_name=user_dto.user_name,
+                user_role=user_dto.user_role,
+            )
 
     async def create_teacher_user(self, user_dto: UserDTO) -> UserDTO:
-        return await self.user_repository.create_teacher_user(
-            user_id=user_dto.user_id,
-            user_name=user_dto.user_name,
-            user_role=user_dto.user_role,
-        )
+        async with unit_of_work():
+            return await self.user_repository.create_teacher_user(
+                user_id=user_dto.user_id,
+                user_name=user_dto.user_name,
+                user_role=user_dto.user_role,
+            )
+
+    async def import_users(
+        self,
+        user_role: UserRole,
+        rows: AsyncIterator[Tuple[int, Union[UserDTO, str]]],
+    ) -> UserImportDTO:
+        summary = UserImportDTO()
+        batch: List[Tuple[int, UserDTO]] = []
+
+        async for line, row in rows:
+            if isinstance(row, str):
+                self.reject(summary, line, row)
+                continue
+
+            batch.append((line, row))
+            if len(batch) >= config.IMPORT_BATCH_SIZE:
+                await self.copy_batch(summary, user_role, batch)
+                batch = []
+
+        if batch:
+            await self.copy_batch(summary, user_role, batch)
+
+        return summary
+
+    async def copy_batch(
+        self,
+        summary: UserImportDTO,
+        user_role: UserRole,
+        batch: List[Tuple[int, UserDTO]],
+    ) -> None:
+        try:
+            created = await self.user_repository.copy_users(
+                user_role=user_role, users=[user for _, user in batch]
+            )
+        except DeadlineExceeded:
+            raise
+        except BaseAPIException as e:
+            for line, _ in batch:
+                self.reject(summary, line, e.message)
+            return
+
+        for line, user in batch:
+            if user.user_id in created:
+                created.discard(user.user_id)
+                summary.imported += 1
+            else:
+                self.reject(summary, line, "Duplicate user ID")
+
+    def reject(self, summary: UserImportDTO, line: int, reason: str) -> None:
+        summary.rejected += 1
+
+        if len(summary.rejected_rows) < config.IMPORT_MAX_REJECTED_ROWS:
+            summary.rejected_rows.append(UserImportRejectDTO(line=line, reason=reason))
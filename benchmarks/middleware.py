@@ -0,0 +1,75 @@
+import asyncio
+import contextvars
+import time
+from uuid import uuid4
+
+from fastapi import FastAPI, Request
+from httpx import ASGITransport, AsyncClient
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.middlewares.sqlalchemy import SQLAlchemyMiddleware
+
+REQUESTS = 5000
+CONCURRENCY = 50
+
+request_context = contextvars.ContextVar("request_context")
+
+
+class LegacyContextMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        token = request_context.set({})
+        try:
+            return await call_next(request)
+        finally:
+            request_context.reset(token)
+
+
+class LegacySQLAlchemyMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        request_context.get()["session_id"] = uuid4().hex
+
+        return await call_next(request)
+
+
+def create_app(legacy: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/")
+    async def root():
+        return {"message": "Hello World"}
+
+    if legacy:
+        app.add_middleware(LegacySQLAlchemyMiddleware)
+        app.add_middleware(LegacyContextMiddleware)
+    else:
+        app.add_middleware(SQLAlchemyMiddleware)
+
+    return app
+
+
+async def run(app: FastAPI) -> float:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        remaining = iter(range(REQUESTS))
+
+        async def worker():
+            for _ in remaining:
+                response = await client.get("/")
+                response.raise_for_status()
+
+        await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+        started = time.perf_counter()
+        remaining = iter(range(REQUESTS))
+        await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+
+        return REQUESTS / (time.perf_counter() - started)
+
+
+async def main():
+    for name, legacy in (("before", True), ("after", False)):
+        rps = await run(create_app(legacy))
+        print(f"{name}: {rps:,.0f} req/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
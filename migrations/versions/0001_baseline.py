@@ -0,0 +1,78 @@
+"""baseline
+
+Revision ID: 0001
+Revises:
+Create Date: 2024-05-20 00:00:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "class",
+        sa.Column("class_id", sa.String(length=255), nullable=False),
+        sa.Column("class_name", sa.String(length=255), nullable=False),
+        sa.Column("teacher_id", sa.String(length=255), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("class_id"),
+        if_not_exists=True,
+    )
+    op.create_index("ix_class_teacher_id", "class", ["teacher_id"], if_not_exists=True)
+    op.create_table(
+        "class_notice",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("class_id", sa.String(length=255), nullable=False),
+        sa.Column("message", sa.String(length=255), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_class_notice_class_id", "class_notice", ["class_id"], if_not_exists=True
+    )
+    op.create_table(
+        "class_student",
+        sa.Column("class_id", sa.String(length=255), nullable=False),
+        sa.Column("student_id", sa.String(length=255), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("class_id", "student_id"),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "student",
+        sa.Column("student_id", sa.String(length=255), nullable=False),
+        sa.Column("student_name", sa.String(length=255), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("student_id"),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "teacher",
+        sa.Column("teacher_id", sa.String(length=255), nullable=False),
+        sa.Column("teacher_name", sa.String(length=255), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("teacher_id"),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("teacher")
+    op.drop_table("student")
+    op.drop_table("class_student")
+    op.drop_index("ix_class_notice_class_id", table_name="class_notice")
+    op.drop_table("class_notice")
+    op.drop_index("ix_class_teacher_id", table_name="class")
+    op.drop_table("class")
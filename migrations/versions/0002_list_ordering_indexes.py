@@ -0,0 +1,65 @@
+"""list ordering indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2024-05-20 00:00:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_class_notice_class_id_created_at_id",
+            "class_notice",
+            ["class_id", sa.text("created_at DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_class_created_at_class_id",
+            "class",
+            [sa.text("created_at DESC"), sa.text("class_id DESC")],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_class_notice_class_id",
+            table_name="class_notice",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_class_notice_class_id",
+            "class_notice",
+            ["class_id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_class_created_at_class_id",
+            table_name="class",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_class_notice_class_id_created_at_id",
+            table_name="class_notice",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,39 @@
+"""class student reverse index
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2024-05-27 00:00:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_class_student_student_id_class_id",
+            "class_student",
+            ["student_id", "class_id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_class_student_student_id_class_id",
+            table_name="class_student",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,66 @@
+"""class filter indexes
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2024-06-03 00:00:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_class_teacher_id_created_at_class_id",
+            "class",
+            ["teacher_id", sa.text("created_at DESC"), sa.text("class_id DESC")],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_class_class_name_pattern",
+            "class",
+            ["class_name"],
+            postgresql_ops={"class_name": "text_pattern_ops"},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_class_teacher_id",
+            table_name="class",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_class_teacher_id",
+            "class",
+            ["teacher_id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_class_class_name_pattern",
+            table_name="class",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_class_teacher_id_created_at_class_id",
+            table_name="class",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
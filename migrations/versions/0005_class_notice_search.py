@@ -0,0 +1,57 @@
+"""class notice search
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2024-06-10 00:00:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0005"
+down_revision: Union[str, Sequence[str], None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_class_notice_message_tsvector",
+            "class_notice",
+            [sa.text("to_tsvector('simple'::regconfig, message)")],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_class_notice_message_trgm",
+            "class_notice",
+            ["message"],
+            postgresql_using="gin",
+            postgresql_ops={"message": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_class_notice_message_trgm",
+            table_name="class_notice",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_class_notice_message_tsvector",
+            table_name="class_notice",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -4,6 +4,7 @@ from unittest.mock import AsyncMock
 from httpx import AsyncClient
 
 from app.main import create_app
+from app.core import query_budget as query_budget_
 from app.core.container import Container
 from app.services import UserService, ClassService
 from app.repositories import UserRepository, ClassRepository
@@ -38,3 +39,8 @@ def user_service_mock(user_repository_mock):
 @pytest.fixture
 def class_service_mock(class_repository_mock):
     return ClassService(class_repository=class_repository_mock)
+
+
+@pytest.fixture
+def query_budget():
+    return query_budget_.query_budget
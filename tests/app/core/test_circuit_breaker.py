@@ -0,0 +1,72 @@
+import pytest
+from unittest.mock import patch
+
+from app.core.circuit_breaker import CircuitBreaker, CircuitBreakerOpen
+
+
+async def fail(breaker: CircuitBreaker):
+    with pytest.raises(ConnectionError):
+        async with breaker:
+            raise ConnectionError()
+
+
+async def test_circuit_breaker_opens_after_threshold():
+    # Setup
+    breaker = CircuitBreaker("test", failure_threshold=2, recovery_timeout=10)
+
+    # Run
+    await fail(breaker)
+    await fail(breaker)
+
+    # Assert
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitBreakerOpen):
+        async with breaker:
+            pass
+    assert breaker.stats()["rejected"] == 1
+
+
+async def test_circuit_breaker_ignores_unexpected_errors():
+    # Setup
+    breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=10)
+
+    # Run
+    with pytest.raises(ValueError):
+        async with breaker:
+            raise ValueError()
+
+    # Assert
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+async def test_circuit_breaker_half_open_probe_closes():
+    # Setup
+    breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=10)
+
+    with patch("app.core.circuit_breaker.time.monotonic", return_value=100.0):
+        await fail(breaker)
+
+    # Run
+    with patch("app.core.circuit_breaker.time.monotonic", return_value=111.0):
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        async with breaker:
+            pass
+
+    # Assert
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+async def test_circuit_breaker_half_open_probe_reopens():
+    # Setup
+    breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=10)
+
+    with patch("app.core.circuit_breaker.time.monotonic", return_value=100.0):
+        await fail(breaker)
+
+    # Run
+    with patch("app.core.circuit_breaker.time.monotonic", return_value=111.0):
+        await fail(breaker)
+
+        # Assert
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.stats()["opened"] == 2
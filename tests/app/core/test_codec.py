@@ -0,0 +1,52 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from app.core.codec import get_codec
+from app.models.dtos.common import PageDTO
+from app.models.dtos.class_ import ClassDTO, ClassNoticeDTO, ClassNoticeListDTO
+
+
+def test_json_codec_round_trips_dtos():
+    # Setup
+    codec = get_codec("json", compression_threshold=0)
+    dto = ClassNoticeListDTO(
+        data=[
+            ClassNoticeDTO(
+                notice_id=1,
+                class_id="class_id",
+                message="message",
+                created_at=datetime(2024, 5, 1, tzinfo=timezone.utc),
+            )
+        ],
+        page=PageDTO(total=1, page=1, limit=10),
+    )
+
+    # Run
+    result = codec.loads(codec.dumps(dto), ClassNoticeListDTO)
+
+    # Assert
+    assert result == dto
+
+
+def test_json_codec_round_trips_none():
+    # Setup
+    codec = get_codec("json", compression_threshold=0)
+
+    # Run
+    result = codec.loads(codec.dumps(None), Optional[ClassDTO])
+
+    # Assert
+    assert result is None
+
+
+def test_codec_compresses_above_threshold():
+    # Setup
+    codec = get_codec("json", compression_threshold=64)
+    dto = ClassDTO(class_id="class_id", class_name="a" * 1024, teacher_id="teacher_id")
+
+    # Run
+    data = codec.dumps(dto)
+
+    # Assert
+    assert len(data) < 1024
+    assert codec.loads(data, ClassDTO) == dto
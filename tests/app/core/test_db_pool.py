@@ -0,0 +1,41 @@
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import exc
+from sqlalchemy.util import greenlet_spawn
+
+from app.core.db.pool import InstrumentedPool
+
+
+async def test_instrumented_pool_records_checkouts():
+    # Setup
+    pool = InstrumentedPool(MagicMock, pool_size=1, max_overflow=1)
+
+    # Run
+    first = pool.connect()
+    second = pool.connect()
+    stats = pool.stats()
+
+    # Assert
+    assert stats["checkedOut"] == 2
+    assert stats["overflow"] == 1
+    assert stats["waitMs"]["count"] == 2
+    assert stats["connectMs"]["count"] == 2
+
+    first.close()
+    second.close()
+
+
+async def test_instrumented_pool_counts_timeouts():
+    # Setup
+    pool = InstrumentedPool(MagicMock, pool_size=1, max_overflow=0, timeout=0.01)
+    connection = pool.connect()
+
+    # Run
+    with pytest.raises(exc.TimeoutError):
+        await greenlet_spawn(pool.connect)
+
+    # Assert
+    assert pool.stats()["timeouts"] == 1
+
+    connection.close()
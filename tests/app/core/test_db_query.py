@@ -0,0 +1,80 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql.asyncpg import PGDialect_asyncpg
+
+from app.core.db.query import (
+    estimate_rows,
+    prefix_upper_bound,
+    starts_with,
+    text_search,
+)
+from app.models.db.class_ import Class, ClassNotice
+
+
+@pytest.mark.parametrize(
+    "prefix,expected",
+    [
+        ("abc", "abd"),
+        ("a\U0010ffff", "b"),
+        ("\ud7ff", "\ue000"),
+        ("\U0010ffff", None),
+    ],
+)
+def test_prefix_upper_bound(prefix: str, expected: str):
+    # Run & Assert
+    assert prefix_upper_bound(prefix) == expected
+
+
+def test_starts_with_uses_pattern_operators():
+    # Run
+    compiled = starts_with(Class.class_name, "10%").compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+
+    # Assert
+    assert "ESCAPE '/'" in str(compiled)
+    assert "class.class_name ~>=~ '10%%'" in str(compiled)
+    assert "class.class_name ~<~ '10&'" in str(compiled)
+
+
+@pytest.mark.parametrize("q,trigram", [("homework", True), ("hw", False)])
+def test_text_search_adds_trigram_match_for_longer_queries(q: str, trigram: bool):
+    # Run
+    match, rank = text_search(ClassNotice.message, q)
+    compiled = str(match.compile(dialect=postgresql.dialect()))
+
+    # Assert
+    assert (
+        "to_tsvector('simple'::regconfig, class_notice.message) @@ "
+        "websearch_to_tsquery(" in compiled
+    )
+    assert ("class_notice.message %%>" in compiled) is trigram
+    assert ("word_similarity" in str(rank.compile())) is trigram
+
+
+async def test_estimate_rows_binds_values():
+    # Setup
+    conn = MagicMock(dialect=PGDialect_asyncpg())
+    result = MagicMock()
+    result.scalar.return_value = [{"Plan": {"Plan Rows": 42}}]
+    conn.exec_driver_sql = AsyncMock(return_value=result)
+    session = MagicMock()
+    session.connection = AsyncMock(return_value=conn)
+    stmt = select(Class.class_id).where(
+        Class.teacher_id == "a :x", starts_with(Class.class_name, "10%")
+    )
+
+    # Run
+    estimate = await estimate_rows(session, stmt)
+
+    # Assert
+    assert estimate == 42
+    statement, params = conn.exec_driver_sql.call_args.args
+    assert statement.startswith("EXPLAIN (FORMAT JSON) SELECT")
+    assert ":x" not in statement and "10%" not in statement
+    assert "class.teacher_id = $1" in statement
+    assert params[0] == "a :x"
+    assert "10%" in params
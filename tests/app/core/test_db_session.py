@@ -0,0 +1,59 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.core.db.session import ReaderBalancer, ReaderSession
+
+
+def engine_mock(checkedout: int = 0) -> MagicMock:
+    engine = MagicMock()
+    engine.pool.checkedout.return_value = checkedout
+    return engine
+
+
+def test_reader_balancer_round_robin():
+    # Setup
+    engines = [engine_mock(), engine_mock()]
+    balancer = ReaderBalancer(engines)
+
+    # Run
+    chosen = [balancer.choose() for _ in range(4)]
+
+    # Assert
+    assert chosen == [engines[0], engines[1], engines[0], engines[1]]
+
+
+def test_reader_balancer_least_connections():
+    # Setup
+    engines = [engine_mock(checkedout=5), engine_mock(checkedout=1)]
+    balancer = ReaderBalancer(engines, strategy=ReaderBalancer.LEAST_CONNECTIONS)
+
+    # Run
+    chosen = balancer.choose()
+
+    # Assert
+    assert chosen is engines[1]
+
+
+def test_reader_balancer_rejects_unknown_strategy():
+    # Run & Assert
+    with pytest.raises(ValueError):
+        ReaderBalancer([engine_mock()], strategy="random")
+
+
+@pytest.mark.parametrize("pinned", [True, False])
+def test_reader_session_routes_pinned_clients_to_primary(pinned: bool):
+    # Setup
+    primary, replica = engine_mock(), engine_mock()
+    session = ReaderSession()
+
+    # Run
+    with (
+        patch("app.core.db.session.is_primary_pinned", return_value=pinned),
+        patch("app.core.db.session.engine", primary),
+        patch("app.core.db.session.reader_balancer", ReaderBalancer([replica])),
+    ):
+        bind = session.get_bind()
+
+    # Assert
+    assert bind is (primary if pinned else replica).sync_engine
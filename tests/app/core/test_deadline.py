@@ -0,0 +1,137 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import Depends, FastAPI
+from httpx import AsyncClient
+from unittest.mock import MagicMock
+
+from app.core.db.session import QUERY_CANCELED, on_begin, on_engine_error
+from app.core.deadline import (
+    REQUEST_TIMEOUT_HEADER,
+    Deadline,
+    RequestDeadline,
+    deadline_timeout,
+    remaining,
+    request_deadline,
+)
+from app.core.errors.error import DeadlineExceeded
+from app.core.middlewares.deadline import DeadlineMiddleware
+
+
+@pytest.fixture
+def deadline():
+    def set_deadline(timeout: float) -> Deadline:
+        now = time.monotonic()
+        deadline = Deadline(started_at=now, expires_at=now + timeout)
+        request_deadline.set(deadline)
+        return deadline
+
+    yield set_deadline
+    request_deadline.set(None)
+
+
+def test_remaining_without_deadline():
+    # Run & Assert
+    assert remaining() is None
+
+
+def test_remaining_raises_after_deadline(deadline):
+    # Setup
+    deadline(-1)
+
+    # Run & Assert
+    with pytest.raises(DeadlineExceeded):
+        remaining()
+
+
+async def test_deadline_timeout_raises_deadline_exceeded(deadline):
+    # Setup
+    deadline(0.01)
+
+    # Run & Assert
+    with pytest.raises(DeadlineExceeded):
+        async with deadline_timeout():
+            await asyncio.sleep(1)
+
+
+async def test_deadline_timeout_keeps_inner_timeouts(deadline):
+    # Setup
+    deadline(10)
+
+    # Run & Assert
+    with pytest.raises(TimeoutError):
+        async with deadline_timeout():
+            raise TimeoutError()
+
+
+def test_on_begin_sets_statement_timeout(deadline):
+    # Setup
+    deadline(1.5)
+    connection = MagicMock()
+
+    # Run
+    on_begin(MagicMock(), MagicMock(), connection)
+
+    # Assert
+    (statement,) = connection.exec_driver_sql.call_args.args
+    assert statement.startswith("SET LOCAL statement_timeout = ")
+    assert 1400 < int(statement.rsplit(" ", 1)[-1]) <= 1500
+
+
+def test_on_begin_skips_without_deadline():
+    # Setup
+    connection = MagicMock()
+
+    # Run
+    on_begin(MagicMock(), MagicMock(), connection)
+
+    # Assert
+    connection.exec_driver_sql.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "sqlstate, expected",
+    [(QUERY_CANCELED, DeadlineExceeded), ("23505", type(None))],
+)
+def test_on_engine_error_maps_query_canceled(deadline, sqlstate, expected):
+    # Setup
+    deadline(10)
+    context = MagicMock()
+    context.original_exception.sqlstate = sqlstate
+
+    # Run
+    result = on_engine_error(context)
+
+    # Assert
+    assert isinstance(result, expected)
+
+
+@pytest.mark.parametrize(
+    "headers, expected",
+    [
+        ({}, 5.0),
+        ({REQUEST_TIMEOUT_HEADER: "0.5"}, 0.5),
+        ({REQUEST_TIMEOUT_HEADER: "60"}, 5.0),
+    ],
+)
+async def test_request_deadline_honors_header(headers, expected):
+    # Setup
+    app = FastAPI()
+
+    @app.get(
+        "/", dependencies=[Depends(RequestDeadline(10)), Depends(RequestDeadline(5))]
+    )
+    async def read():
+        deadline = request_deadline.get()
+        return deadline.expires_at - deadline.started_at
+
+    app.add_middleware(DeadlineMiddleware)
+    client = AsyncClient(app=app, base_url="http://test")
+
+    # Run
+    response = await client.get("/", headers=headers)
+
+    # Assert
+    assert response.json() == pytest.approx(expected)
+    assert request_deadline.get() is None
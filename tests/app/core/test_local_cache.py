@@ -0,0 +1,68 @@
+from unittest.mock import patch
+
+from app.core.local_cache import LocalCache
+
+
+def test_local_cache_hit_and_miss():
+    # Setup
+    cache = LocalCache(max_items=10, max_bytes=1024, ttl=5)
+    cache.set("key", b"value")
+
+    # Run
+    hit = cache.get("key")
+    miss = cache.get("unknown")
+
+    # Assert
+    assert hit == b"value"
+    assert miss is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_local_cache_evicts_least_recently_used():
+    # Setup
+    cache = LocalCache(max_items=2, max_bytes=1024, ttl=5)
+    cache.set("a", b"1")
+    cache.set("b", b"2")
+    cache.get("a")
+
+    # Run
+    cache.set("c", b"3")
+
+    # Assert
+    assert cache.peek("a") == b"1"
+    assert cache.peek("b") is None
+    assert cache.peek("c") == b"3"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_local_cache_respects_memory_budget():
+    # Setup
+    cache = LocalCache(max_items=10, max_bytes=8, ttl=5)
+    cache.set("a", b"1234")
+    cache.set("b", b"5678")
+
+    # Run
+    cache.set("c", b"90")
+    cache.set("too_big", b"123456789")
+
+    # Assert
+    assert cache.peek("a") is None
+    assert cache.peek("too_big") is None
+    assert cache.stats()["bytes"] <= 8
+
+
+def test_local_cache_expires_entries():
+    # Setup
+    cache = LocalCache(max_items=10, max_bytes=1024, ttl=5)
+
+    with patch("app.core.local_cache.time.monotonic", return_value=100.0):
+        cache.set("key", b"value", ttl=60)
+
+    # Run
+    with patch("app.core.local_cache.time.monotonic", return_value=106.0):
+        result = cache.get("key")
+
+    # Assert
+    assert result is None
+    assert len(cache) == 0
@@ -0,0 +1,74 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from fastapi import FastAPI
+from httpx import AsyncClient
+
+from app.core.db.session import on_before_cursor_execute
+from app.core.middlewares.query_budget import QueryBudgetMiddleware
+from app.core.query_budget import QueryBudgetExceeded, count_queries
+from app.core.redis import RedisCache
+
+
+def execute(statement: str):
+    on_before_cursor_execute(MagicMock(info={}), None, statement)
+
+
+def create_cache() -> RedisCache:
+    cache = RedisCache()
+    cache.redis = MagicMock()
+    cache.redis.mget = AsyncMock(return_value=[None])
+    return cache
+
+
+async def test_count_queries_counts_nested_scopes(query_budget):
+    # Setup
+    cache = create_cache()
+
+    # Run
+    with count_queries() as outer:
+        execute("SELECT 1")
+        with query_budget(statements=1, redis_calls=1) as inner:
+            execute("SELECT 2")
+            await cache.get("key")
+
+    # Assert
+    assert (outer.statements, outer.redis_calls) == (2, 1)
+    assert (inner.statements, inner.redis_calls) == (1, 1)
+
+
+@pytest.mark.parametrize(
+    "statements, redis_calls", [(1, None), (None, 0), (1, 0)], ids=str
+)
+async def test_query_budget_raises_when_exceeded(query_budget, statements, redis_calls):
+    # Setup
+    cache = create_cache()
+
+    # Run & Assert
+    with pytest.raises(QueryBudgetExceeded, match="repeated 2 times: SELECT 1"):
+        with query_budget(statements=statements, redis_calls=redis_calls):
+            execute("SELECT 1")
+            execute("SELECT 1")
+            await cache.get("key")
+
+
+@pytest.mark.parametrize("statements, warned", [(2, False), (1, True)])
+async def test_middleware_warns_over_budget(statements, warned, monkeypatch):
+    # Setup
+    logger_mock = MagicMock()
+    monkeypatch.setattr("app.core.middlewares.query_budget.logger", logger_mock)
+    app = FastAPI()
+
+    @app.get("/notices")
+    async def read():
+        execute("SELECT * FROM class_notice WHERE id = $1")
+        execute("SELECT * FROM class_notice WHERE id = $1")
+
+    app.add_middleware(QueryBudgetMiddleware, statements=statements)
+    client = AsyncClient(app=app, base_url="http://test")
+
+    # Run
+    await client.get("/notices")
+
+    # Assert
+    assert logger_mock.warning.called is warned
@@ -0,0 +1,530 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.core.db.session import (
+    SessionScope,
+    get_session_id,
+    is_primary_pinned,
+    session_scope,
+)
+from app.core.db.uow import unit_of_work
+from app.core.deadline import Deadline, remaining, request_deadline
+from app.core.errors.error import DeadlineExceeded
+from app.core.local_cache import LocalCache
+from app.core.query_budget import count_queries, query_counters
+from app.core.redis import (
+    MISSING,
+    CacheEntry,
+    RedisCache,
+    RedisCacheDecorator,
+    RedisCacheInvalidateDecorator,
+)
+
+
+async def test_cache_decorator_sets_tags():
+    # Setup
+    func = AsyncMock(return_value="result")
+    func.__name__ = "read_class"
+    decorated = RedisCacheDecorator(ttl=30, tags=["class:{class_id}"])(func)
+
+    with patch("app.core.redis.redis_cache") as redis_cache_mock:
+        redis_cache_mock.namespace = "v2.json"
+        redis_cache_mock.get_entry = AsyncMock(return_value=None)
+        redis_cache_mock.acquire_lock = AsyncMock(return_value=object())
+        redis_cache_mock.release_lock = AsyncMock()
+        redis_cache_mock.tag_versions = AsyncMock(return_value=[])
+        redis_cache_mock.set = AsyncMock()
+
+        # Run
+        result = await decorated(class_id="class_id")
+
+    # Assert
+    assert result == "result"
+    redis_cache_mock.set.assert_called_once_with(
+        "v2.json:read_class.{'class_id': 'class_id'}",
+        "result",
+        ttl=30,
+        tags=["class:class_id"],
+        hard_ttl=None,
+        versions=[],
+    )
+
+
+async def test_cache_decorator_coalesces_concurrent_misses():
+    # Setup
+    async def read_class_notice_list(class_id: str):
+        await asyncio.sleep(0.01)
+        return "result"
+
+    func = AsyncMock(side_effect=read_class_notice_list)
+    func.__name__ = "read_class_notice_list"
+    decorated = RedisCacheDecorator()(func)
+
+    with patch("app.core.redis.redis_cache") as redis_cache_mock:
+        redis_cache_mock.get_entry = AsyncMock(return_value=None)
+        redis_cache_mock.acquire_lock = AsyncMock(return_value=object())
+        redis_cache_mock.release_lock = AsyncMock()
+        redis_cache_mock.tag_versions = AsyncMock(return_value=[])
+        redis_cache_mock.set = AsyncMock()
+
+        # Run
+        results = await asyncio.gather(
+            *[decorated(class_id="class_id") for _ in range(10)]
+        )
+
+    # Assert
+    assert results == ["result"] * 10
+    func.assert_called_once_with(class_id="class_id")
+    redis_cache_mock.acquire_lock.assert_called_once()
+    redis_cache_mock.release_lock.assert_called_once()
+
+
+async def test_cache_decorator_waits_for_other_worker():
+    # Setup
+    func = AsyncMock(return_value="result")
+    func.__name__ = "read_class"
+    decorated = RedisCacheDecorator(lock_poll_interval=0)(func)
+
+    with patch("app.core.redis.redis_cache") as redis_cache_mock:
+        redis_cache_mock.get_entry = AsyncMock(return_value=None)
+        redis_cache_mock.get = AsyncMock(side_effect=[MISSING, "cached"])
+        redis_cache_mock.is_locked = AsyncMock(return_value=True)
+        redis_cache_mock.acquire_lock = AsyncMock(return_value=None)
+
+        # Run
+        result = await decorated(class_id="class_id")
+
+    # Assert
+    assert result == "cached"
+    func.assert_not_called()
+
+
+async def test_cache_decorator_hit_takes_single_get():
+    # Setup
+    func = AsyncMock(return_value="result")
+    func.__name__ = "read_class"
+    decorated = RedisCacheDecorator()(func)
+
+    with patch("app.core.redis.redis_cache") as redis_cache_mock:
+        redis_cache_mock.get_entry = AsyncMock(
+            return_value=CacheEntry(value=None, fresh_until=float("inf"))
+        )
+
+        # Run
+        result = await decorated(class_id="class_id")
+
+    # Assert
+    assert result is None
+    func.assert_not_called()
+    redis_cache_mock.get_entry.assert_called_once()
+    redis_cache_mock.exists.assert_not_called()
+
+
+async def test_cache_decorator_caches_none_with_negative_ttl():
+    # Setup
+    func = AsyncMock(return_value=None)
+    func.__name__ = "read_class"
+    decorated = RedisCacheDecorator(
+        ttl=3600, negative_ttl=10, tags=["class:{class_id}"]
+    )(func)
+
+    with patch("app.core.redis.redis_cache") as redis_cache_mock:
+        redis_cache_mock.namespace = "v2.json"
+        redis_cache_mock.get_entry = AsyncMock(return_value=None)
+        redis_cache_mock.acquire_lock = AsyncMock(return_value=object())
+        redis_cache_mock.release_lock = AsyncMock()
+        redis_cache_mock.tag_versions = AsyncMock(return_value=[])
+        redis_cache_mock.set = AsyncMock()
+
+        # Run
+        result = await decorated(class_id="class_id")
+
+    # Assert
+    assert result is None
+    redis_cache_mock.set.assert_called_once_with(
+        "v2.json:read_class.{'class_id': 'class_id'}",
+        None,
+        ttl=10,
+        tags=["class:class_id"],
+        hard_ttl=None,
+        versions=[],
+    )
+
+
+async def test_cache_decorator_serves_stale_and_revalidates():
+    # Setup
+    func = AsyncMock(return_value="fresh")
+    func.__name__ = "read_class_list"
+    decorated = RedisCacheDecorator(ttl=60, hard_ttl=3600)(func)
+
+    with patch("app.core.redis.redis_cache") as redis_cache_mock:
+        redis_cache_mock.get_entry = AsyncMock(
+            return_value=CacheEntry(value="stale", fresh_until=0)
+        )
+        redis_cache_mock.acquire_lock = AsyncMock(return_value=object())
+        redis_cache_mock.release_lock = AsyncMock()
+        redis_cache_mock.tag_versions = AsyncMock(return_value=[])
+        redis_cache_mock.set = AsyncMock()
+
+        # Run
+        result = await decorated(page=1, limit=10)
+        await asyncio.sleep(0)
+
+    # Assert
+    assert result == "stale"
+    func.assert_called_once_with(page=1, limit=10)
+    assert redis_cache_mock.set.call_args.kwargs["hard_ttl"] == 3600
+
+
+async def test_cache_decorator_revalidates_in_own_session_scope():
+    # Setup
+    seen = {}
+
+    async def read_class_list(page: int, limit: int):
+        seen["session_id"] = get_session_id()
+        seen["counters"] = query_counters.get()
+        return "fresh"
+
+    decorator = RedisCacheDecorator(ttl=60, hard_ttl=3600)
+    decorated = decorator(read_class_list)
+    token = session_scope.set(SessionScope(session_id="request"))
+
+    with patch("app.core.redis.redis_cache") as redis_cache_mock, patch(
+        "app.core.db.session.AsyncScopedReaderSession"
+    ) as reader_session_mock, count_queries():
+        redis_cache_mock.get_entry = AsyncMock(
+            return_value=CacheEntry(value="stale", fresh_until=0)
+        )
+        redis_cache_mock.acquire_lock = AsyncMock(return_value=object())
+        redis_cache_mock.release_lock = AsyncMock()
+        redis_cache_mock.tag_versions = AsyncMock(return_value=[])
+        redis_cache_mock.set = AsyncMock()
+        reader_session_mock.remove = AsyncMock()
+
+        # Run
+        await decorated(page=1, limit=10)
+        await asyncio.gather(*decorator._revalidating.values())
+
+    session_scope.reset(token)
+
+    # Assert
+    assert seen["session_id"] not in (None, "request")
+    assert seen["counters"] == ()
+    reader_session_mock.remove.assert_called_once()
+
+
+async def test_cache_decorator_load_survives_first_caller():
+    # Setup
+    seen = {}
+    started = asyncio.Event()
+
+    async def read_class(class_id: str):
+        seen["session_id"] = get_session_id()
+        started.set()
+        await asyncio.sleep(0.01)
+        return "result"
+
+    decorated = RedisCacheDecorator()(read_class)
+
+    async def request(session_id: str):
+        session_scope.set(SessionScope(session_id=session_id))
+        return await decorated(class_id="class_id")
+
+    with patch("app.core.redis.redis_cache") as redis_cache_mock:
+        redis_cache_mock.get_entry = AsyncMock(return_value=None)
+        redis_cache_mock.acquire_lock = AsyncMock(return_value=object())
+        redis_cache_mock.release_lock = AsyncMock()
+        redis_cache_mock.tag_versions = AsyncMock(return_value=[])
+        redis_cache_mock.set = AsyncMock()
+
+        # Run
+        first = asyncio.create_task(request("first"))
+        await started.wait()
+        second = asyncio.create_task(request("second"))
+        await asyncio.sleep(0)
+        first.cancel()
+        result = await second
+
+    # Assert
+    assert result == "result"
+    assert seen["session_id"] not in ("first", "second")
+
+
+async def test_cache_decorator_pinned_caller_skips_shared_load():
+    # Setup
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def read_class(class_id: str):
+        if is_primary_pinned():
+            return "primary"
+
+        started.set()
+        await release.wait()
+        return "replica"
+
+    decorated = RedisCacheDecorator()(read_class)
+
+    async def request(primary_until: float):
+        session_scope.set(SessionScope(session_id="s", primary_until=primary_until))
+        return await decorated(class_id="class_id")
+
+    with patch("app.core.redis.redis_cache") as redis_cache_mock:
+        redis_cache_mock.get_entry = AsyncMock(return_value=None)
+        redis_cache_mock.acquire_lock = AsyncMock(return_value=object())
+        redis_cache_mock.release_lock = AsyncMock()
+        redis_cache_mock.tag_versions = AsyncMock(return_value=[])
+        redis_cache_mock.set = AsyncMock()
+
+        # Run
+        unpinned = asyncio.create_task(request(0.0))
+        await started.wait()
+        pinned = await asyncio.wait_for(request(time.time() + 5), timeout=1)
+        release.set()
+        result = await unpinned
+
+    # Assert
+    assert pinned == "primary"
+    assert result == "replica"
+    redis_cache_mock.get_entry.assert_called_once()
+    redis_cache_mock.set.assert_called_once()
+
+
+async def test_cache_decorator_load_ignores_first_caller_deadline():
+    # Setup
+    async def read_class(class_id: str):
+        await asyncio.sleep(0.05)
+        return "result"
+
+    decorated = RedisCacheDecorator()(read_class)
+
+    async def request(timeout: float):
+        now = time.monotonic()
+        request_deadline.set(Deadline(started_at=now, expires_at=now + timeout))
+        return await decorated(class_id="class_id")
+
+    with patch("app.core.redis.redis_cache") as redis_cache_mock:
+        redis_cache_mock.get_entry = AsyncMock(return_value=None)
+        redis_cache_mock.acquire_lock = AsyncMock(return_value=object())
+        redis_cache_mock.release_lock = AsyncMock()
+        redis_cache_mock.tag_versions = AsyncMock(return_value=[])
+        redis_cache_mock.set = AsyncMock()
+
+        # Run
+        results = await asyncio.gather(
+            request(0.01), request(10), return_exceptions=True
+        )
+
+    # Assert
+    assert isinstance(results[0], DeadlineExceeded)
+    assert results[1] == "result"
+
+
+async def test_cache_decorator_serves_stale_if_error():
+    # Setup
+    func = AsyncMock(side_effect=ConnectionError())
+    func.__name__ = "read_class_list"
+    decorated = RedisCacheDecorator(ttl=60, hard_ttl=3600)(func)
+
+    with patch("app.core.redis.redis_cache") as redis_cache_mock:
+        redis_cache_mock.get_entry = AsyncMock(
+            return_value=CacheEntry(value="stale", fresh_until=0)
+        )
+        redis_cache_mock.acquire_lock = AsyncMock(return_value=object())
+        redis_cache_mock.release_lock = AsyncMock()
+
+        # Run
+        first = await decorated(page=1, limit=10)
+        await asyncio.sleep(0)
+        second = await decorated(page=1, limit=10)
+
+    # Assert
+    assert first == "stale"
+    assert second == "stale"
+
+
+async def test_invalidate_decorator_purges_tags():
+    # Setup
+    func = AsyncMock(return_value="result")
+    decorated = RedisCacheInvalidateDecorator(tags=["class_notice:{class_id}"])(func)
+
+    with patch("app.core.redis.redis_cache") as redis_cache_mock:
+        redis_cache_mock.invalidate_tags = AsyncMock()
+
+        # Run
+        result = await decorated(class_id="class_id", message="message")
+
+    # Assert
+    assert result == "result"
+    redis_cache_mock.invalidate_tags.assert_called_once_with("class_notice:class_id")
+
+
+async def test_invalidate_decorator_ignores_cache_errors():
+    # Setup
+    func = AsyncMock(return_value="result")
+    decorated = RedisCacheInvalidateDecorator(tags=["class_list"])(func)
+
+    with patch("app.core.redis.redis_cache") as redis_cache_mock:
+        redis_cache_mock.invalidate_tags = AsyncMock(side_effect=ConnectionError())
+
+        # Run
+        result = await decorated(class_id="class_id")
+
+    # Assert
+    assert result == "result"
+
+
+async def test_invalidate_decorator_purges_result_tags():
+    # Setup
+    func = AsyncMock(return_value=["class_a", "class_b"])
+    decorated = RedisCacheInvalidateDecorator(
+        tags=[], result_tags=lambda class_ids: [f"class:{id_}" for id_ in class_ids]
+    )(func)
+
+    with patch("app.core.redis.redis_cache") as redis_cache_mock:
+        redis_cache_mock.invalidate_tags = AsyncMock()
+
+        # Run
+        await decorated(message="message")
+
+    # Assert
+    redis_cache_mock.invalidate_tags.assert_called_once_with(
+        "class:class_a", "class:class_b"
+    )
+
+
+async def test_invalidate_decorator_purges_again_after_replica_lag():
+    # Setup
+    func = AsyncMock(return_value="result")
+    decorator = RedisCacheInvalidateDecorator(tags=["class_list"], replica_lag=0.01)
+    decorated = decorator(func)
+
+    with patch("app.core.redis.redis_cache") as redis_cache_mock:
+        redis_cache_mock.invalidate_tags = AsyncMock()
+
+        # Run
+        await decorated(class_id="class_id")
+        await asyncio.gather(*decorator._delayed)
+
+    # Assert
+    assert redis_cache_mock.invalidate_tags.call_count == 2
+    redis_cache_mock.invalidate_tags.assert_called_with("class_list")
+
+
+async def test_invalidate_decorator_ignores_request_deadline():
+    # Setup
+    func = AsyncMock(return_value="result")
+    decorator = RedisCacheInvalidateDecorator(tags=["class_list"], replica_lag=0.01)
+    decorated = decorator(func)
+
+    async def invalidate_tags(*tags):
+        # Raises DeadlineExceeded under an expired request deadline.
+        remaining()
+
+    now = time.monotonic()
+    token = request_deadline.set(Deadline(started_at=now - 2, expires_at=now - 1))
+
+    try:
+        with patch("app.core.redis.redis_cache") as redis_cache_mock, patch(
+            "app.core.redis.logger"
+        ) as logger_mock:
+            redis_cache_mock.invalidate_tags = AsyncMock(side_effect=invalidate_tags)
+
+            # Run
+            async with unit_of_work():
+                await decorated(class_id="class_id")
+            await asyncio.gather(*decorator._delayed)
+    finally:
+        request_deadline.reset(token)
+
+    # Assert
+    assert redis_cache_mock.invalidate_tags.call_count == 2
+    logger_mock.error.assert_not_called()
+
+
+async def test_mget_reads_local_tier_then_redis_in_one_call():
+    # Setup
+    cache = RedisCache()
+    cache.local = LocalCache(max_items=10, max_bytes=1024, ttl=5)
+    cache.local.set("local", cache.encode("local_value", ttl=60))
+    cache.redis = MagicMock()
+    cache.redis.mget = AsyncMock(return_value=[cache.encode("remote_value"), None])
+
+    # Run
+    results = await cache.mget(["local", "remote", "missing"])
+
+    # Assert
+    assert results == ["local_value", "remote_value", MISSING]
+    cache.redis.mget.assert_called_once_with(["remote", "missing"])
+    assert cache.local.peek("remote") is not None
+
+
+async def test_invalidate_decorator_waits_for_unit_of_work_commit():
+    # Setup
+    func = AsyncMock(return_value="result")
+    decorated = RedisCacheInvalidateDecorator(tags=["class_list"], replica_lag=0)(func)
+
+    with patch("app.core.redis.redis_cache") as redis_cache_mock:
+        redis_cache_mock.invalidate_tags = AsyncMock()
+
+        # Run
+        async with unit_of_work():
+            await decorated(class_id="class_id")
+
+            # Assert
+            redis_cache_mock.invalidate_tags.assert_not_called()
+
+    redis_cache_mock.invalidate_tags.assert_called_once_with("class_list")
+
+
+def test_cache_decorator_skips_tags_for_missing_arguments():
+    # Setup
+    decorator = RedisCacheDecorator(tags=["class_notice:{class_id}", "class_notice"])
+
+    # Run & Assert
+    assert decorator.tags_builder({"class_id": None, "q": "q"}) == ["class_notice"]
+    assert decorator.tags_builder({"class_id": "c"}) == [
+        "class_notice:c",
+        "class_notice",
+    ]
+
+
+async def test_mset_skips_write_after_concurrent_invalidation():
+    # Setup
+    cache = RedisCache()
+    pipe = MagicMock()
+    pipe.watch = AsyncMock()
+    pipe.mget = AsyncMock(return_value=[b"2"])
+    pipe.execute = AsyncMock()
+    cache.redis = MagicMock()
+    cache.redis.pipeline.return_value.__aenter__ = AsyncMock(return_value=pipe)
+    cache.redis.pipeline.return_value.__aexit__ = AsyncMock(return_value=False)
+
+    # Run
+    size = await cache.set("key", "stale", ttl=60, tags=["class:a"], versions=[b"1"])
+
+    # Assert
+    assert size == 0
+    pipe.watch.assert_called_once_with("tagver:class:a")
+    pipe.set.assert_not_called()
+    pipe.execute.assert_not_called()
+
+
+async def test_invalidate_tags_bumps_tag_versions():
+    # Setup
+    cache = RedisCache()
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=[1, True, {b"key"}])
+    cache.redis = MagicMock()
+    cache.redis.pipeline.return_value.__aenter__ = AsyncMock(return_value=pipe)
+    cache.redis.pipeline.return_value.__aexit__ = AsyncMock(return_value=False)
+    cache.redis.unlink = AsyncMock()
+
+    # Run
+    keys = await cache.invalidate_tags("class:a")
+
+    # Assert
+    assert keys == ["key"]
+    pipe.incr.assert_called_once_with("tagver:class:a")
+    cache.redis.unlink.assert_called_once_with("key", "tag:class:a")
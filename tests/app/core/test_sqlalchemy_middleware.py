@@ -0,0 +1,110 @@
+import time
+import pytest
+
+from httpx import AsyncClient
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.core.db.session import get_session_id, is_primary_pinned, pin_primary
+from app.core.config import config
+from app.core.middlewares.sqlalchemy import (
+    PRIMARY_UNTIL_COOKIE,
+    SQLAlchemyMiddleware,
+    parse_primary_until,
+)
+
+
+async def read(request):
+    return JSONResponse({"sessionId": get_session_id(), "pinned": is_primary_pinned()})
+
+
+async def write(request):
+    pin_primary()
+    return JSONResponse({"sessionId": get_session_id()})
+
+
+async def stream(request):
+    async def body():
+        yield get_session_id().encode()
+
+    return StreamingResponse(body())
+
+
+def create_client() -> AsyncClient:
+    app = Starlette(
+        routes=[Route("/read", read), Route("/write", write), Route("/stream", stream)]
+    )
+    app.add_middleware(SQLAlchemyMiddleware)
+    return AsyncClient(app=app, base_url="http://test")
+
+
+async def test_middleware_scopes_session_per_request():
+    # Setup
+    client = create_client()
+
+    # Run
+    first = (await client.get("/read")).json()
+    second = (await client.get("/read")).json()
+
+    # Assert
+    assert first["sessionId"] and second["sessionId"]
+    assert first["sessionId"] != second["sessionId"]
+    assert first["pinned"] is False
+    assert get_session_id() is None
+
+
+async def test_middleware_sets_primary_cookie_after_write():
+    # Setup
+    client = create_client()
+
+    # Run
+    response = await client.get("/write")
+
+    # Assert
+    assert PRIMARY_UNTIL_COOKIE in response.cookies
+    assert float(response.cookies[PRIMARY_UNTIL_COOKIE]) > time.time()
+
+
+async def test_middleware_pins_client_with_primary_cookie():
+    # Setup
+    client = create_client()
+    cookies = {PRIMARY_UNTIL_COOKIE: str(time.time() + 60)}
+
+    # Run
+    response = await client.get("/read", cookies=cookies)
+
+    # Assert
+    assert response.json()["pinned"] is True
+    assert PRIMARY_UNTIL_COOKIE not in response.cookies
+
+
+@pytest.mark.parametrize("value", ["inf", "nan", "-inf", "invalid"])
+def test_parse_primary_until_rejects_non_finite(value: str):
+    # Run
+    primary_until = parse_primary_until(value)
+
+    # Assert
+    assert primary_until == 0.0
+
+
+def test_parse_primary_until_clamps_to_window():
+    # Setup
+    now = time.time()
+
+    # Run
+    primary_until = parse_primary_until(str(now + 86400 * 365))
+
+    # Assert
+    assert now < primary_until <= time.time() + config.DB_READ_YOUR_WRITES_WINDOW
+
+
+async def test_middleware_keeps_scope_for_streaming_responses():
+    # Setup
+    client = create_client()
+
+    # Run
+    response = await client.get("/stream")
+
+    # Assert
+    assert len(response.text) == 32
@@ -0,0 +1,82 @@
+import pytest
+
+from app.core.errors import error
+from app.core.streaming import CSV, NDJSON, get_format, iter_lines, iter_records
+
+
+async def stream(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+async def collect(iterator):
+    return [item async for item in iterator]
+
+
+async def test_iter_lines_joins_lines_split_across_chunks():
+    # Run
+    lines = await collect(iter_lines(stream(b"a,b\r\nc", b"d\n", b"e"), 1024))
+
+    # Assert
+    assert lines == [(1, "a,b"), (2, "cd"), (3, "e")]
+
+
+async def test_iter_lines_skips_overlong_lines():
+    # Run
+    lines = await collect(iter_lines(stream(b"ok\n" + b"x" * 10, b"xx\nok"), 5))
+
+    # Assert
+    assert lines == [(1, "ok"), (2, None), (3, "ok")]
+
+
+async def test_iter_lines_rejects_invalid_utf8():
+    # Run & Assert
+    with pytest.raises(error.InvalidImportFile):
+        await collect(iter_lines(stream(b"\xff\xfe\n"), 1024))
+
+
+async def test_iter_records_csv():
+    # Setup
+    body = b'userId,userName\nid_1,"Kim, Minsu"\nid_2\n'
+
+    # Run
+    records = await collect(iter_records(stream(body), CSV, 1024))
+
+    # Assert
+    assert records == [
+        (2, {"userId": "id_1", "userName": "Kim, Minsu"}),
+        (3, "Column count does not match header"),
+    ]
+
+
+async def test_iter_records_ndjson():
+    # Setup
+    body = b'{"userName": "a"}\n\n[1]\n{bad\n'
+
+    # Run
+    records = await collect(iter_records(stream(body), NDJSON, 1024))
+
+    # Assert
+    assert records == [
+        (1, {"userName": "a"}),
+        (3, "Expected a JSON object"),
+        (4, "Invalid JSON"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "content_type,expected",
+    [
+        ("text/csv; charset=utf-8", CSV),
+        ("application/x-ndjson", NDJSON),
+    ],
+)
+def test_get_format(content_type: str, expected: str):
+    # Run & Assert
+    assert get_format(content_type) == expected
+
+
+def test_get_format_rejects_unknown_content_type():
+    # Run & Assert
+    with pytest.raises(error.InvalidImportFile):
+        get_format("application/json")
@@ -0,0 +1,74 @@
+import re
+from unittest.mock import MagicMock
+
+from fastapi import FastAPI
+from httpx import AsyncClient
+
+from app.core.db.session import on_after_cursor_execute, on_before_cursor_execute
+from app.core.middlewares.timing import ServerTimingMiddleware
+from app.core.redis import RedisCache
+from app.core.timing import CACHE, DB, SERVICE, ServerTiming, measure, timed
+from app.models.schemas.common import HttpResponse
+
+
+def test_server_timing_counts_nested_scopes_once():
+    # Setup
+    timing = ServerTiming()
+
+    # Run
+    with timing.measure(SERVICE):
+        with timing.measure(SERVICE):
+            pass
+    timing.record(DB, 1.25)
+    timing.record(DB, 2.0)
+
+    # Assert
+    assert timing.timings[SERVICE].count == 1
+    header = timing.header()
+    assert 'db;dur=3.2;desc="2 queries"' in header
+    assert re.search(r"service;dur=[\d.]+, ", header)
+    assert re.search(r"total;dur=[\d.]+$", header)
+
+
+def test_measure_without_request_is_noop():
+    # Run & Assert
+    with measure(SERVICE):
+        pass
+
+
+async def test_middleware_reports_breakdown():
+    # Setup
+    @timed(SERVICE)
+    class Service:
+        async def read(self):
+            connection = MagicMock(info={})
+            on_before_cursor_execute(connection, None, "SELECT 1")
+            on_after_cursor_execute(connection)
+
+            cache = RedisCache()
+            cache.redis = MagicMock()
+            cache.redis.ping = MagicMock(side_effect=self.ping)
+            await cache.ping()
+
+        async def ping(self):
+            return True
+
+    app = FastAPI()
+
+    @app.get("/")
+    async def read():
+        await Service().read()
+        return HttpResponse(content={"ok": True})
+
+    app.add_middleware(ServerTimingMiddleware)
+    client = AsyncClient(app=app, base_url="http://test")
+
+    # Run
+    response = await client.get("/")
+
+    # Assert
+    names = [
+        metric.split(";")[0] for metric in response.headers["server-timing"].split(", ")
+    ]
+    assert names == [DB, CACHE, SERVICE, "serialize", "total"]
+    assert 'desc="1 queries"' in response.headers["server-timing"]
@@ -0,0 +1,71 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.core.db.uow import current_unit_of_work, unit_of_work
+
+
+@pytest.fixture
+def session_mock():
+    session = MagicMock()
+    session.commit = AsyncMock()
+    session.rollback = AsyncMock()
+    session.close = AsyncMock()
+
+    with patch("app.core.db.uow.AsyncScopedSession", return_value=session):
+        yield session
+
+
+async def test_unit_of_work_commits_nested_scopes_once(session_mock):
+    # Run
+    async with unit_of_work() as outer:
+        async with unit_of_work() as inner:
+            inner.session
+
+        # Assert
+        assert inner is outer
+        session_mock.commit.assert_not_called()
+
+    session_mock.commit.assert_called_once()
+    session_mock.close.assert_called_once()
+    assert current_unit_of_work.get() is None
+
+
+async def test_unit_of_work_rolls_back_on_error(session_mock):
+    # Setup
+    hook = AsyncMock()
+
+    # Run
+    with pytest.raises(ValueError):
+        async with unit_of_work() as uow:
+            uow.session
+            uow.after_commit(hook)
+            raise ValueError()
+
+    # Assert
+    session_mock.rollback.assert_called_once()
+    session_mock.commit.assert_not_called()
+    hook.assert_not_called()
+    assert current_unit_of_work.get() is None
+
+
+async def test_unit_of_work_runs_hooks_after_release(session_mock):
+    # Setup
+    hook = AsyncMock(side_effect=lambda: session_mock.close.assert_called_once())
+
+    # Run
+    async with unit_of_work() as uow:
+        uow.session
+        uow.after_commit(hook)
+
+    # Assert
+    hook.assert_called_once()
+
+
+async def test_unit_of_work_skips_checkout_without_session():
+    # Run
+    with patch("app.core.db.uow.AsyncScopedSession") as session_factory_mock:
+        async with unit_of_work():
+            pass
+
+    # Assert
+    session_factory_mock.assert_not_called()
@@ -1,16 +1,29 @@
+import time
 import pytest
 from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from httpx import AsyncClient
 
 from app.core.container import Container
+from app.core.db.session import (
+    on_after_cursor_execute,
+    on_before_cursor_execute,
+    on_begin,
+)
 from app.core.errors import error
+from app.core.pagination import encode_cursor
+from app.core.redis import CacheEntry
 from app.models.dtos.common import PageDTO
 from app.models.dtos.class_ import (
+    ClassBulkItemDTO,
     ClassDTO,
+    ClassEnrollDTO,
     ClassListDTO,
     ClassNoticeDTO,
     ClassNoticeListDTO,
+    ClassStudentDTO,
+    ClassStudentListDTO,
 )
 from app.models.schemas.class_ import ClassReq, ClassNoticeReq
 from app.services import ClassService
@@ -59,6 +72,70 @@ async def test_create_class_200(
     assert json_response["data"]["teacherId"] == class_dto.teacher_id
 
 
+async def test_create_classes_200(
+    container: Container,
+    async_client: AsyncClient,
+    class_service_mock: ClassService,
+):
+    # Setup
+    # Request
+    data = [
+        ClassReq(className="class_a", teacherId="teacher_id").model_dump(),
+        ClassReq(className="class_b", teacherId="teacher_id").model_dump(),
+    ]
+    # Respository
+    class_service_mock.class_repository.create_classes.return_value = [
+        ClassBulkItemDTO(
+            index=0,
+            data=ClassDTO(
+                class_id="-",
+                class_name="class_a",
+                teacher_id="teacher_id",
+                created_at=datetime.now(),
+            ),
+        ),
+        ClassBulkItemDTO(
+            index=1,
+            error_code=error.ERROR_400_CLASS_CREATION_FAILED,
+            error_message="Class creation failed",
+        ),
+    ]
+    container.class_service.override(class_service_mock)
+
+    # Run
+    headers = {"x-api-key": "test-api-key"}
+    url = "/v1/class/bulk"
+    response = await async_client.post(url, headers=headers, json=data)
+    json_response = response.json()
+
+    # Assert
+    assert response.status_code == 200
+    assert json_response["data"]["succeeded"] == 1
+    assert json_response["data"]["failed"] == 1
+    assert json_response["data"]["data"][0]["data"]["className"] == "class_a"
+    assert (
+        json_response["data"]["data"][1]["errorCode"]
+        == error.ERROR_400_CLASS_CREATION_FAILED
+    )
+
+    classes = class_service_mock.class_repository.create_classes.call_args.kwargs[
+        "classes"
+    ]
+    assert [class_.class_name for class_ in classes] == ["class_a", "class_b"]
+
+
+async def test_create_classes_422(
+    async_client: AsyncClient,
+):
+    # Run
+    headers = {"x-api-key": "test-api-key"}
+    url = "/v1/class/bulk"
+    response = await async_client.post(url, headers=headers, json=[])
+
+    # Assert
+    assert response.status_code == 422
+
+
 @pytest.mark.parametrize(
     "page,limit",
     [
@@ -119,6 +196,142 @@ async def test_read_class_list_200(
     assert result["teacherId"] == class_dto.teacher_id
 
 
+@pytest.mark.parametrize(
+    "cursor,limit",
+    [
+        ("cursor", 10),
+    ],
+)
+async def test_read_class_list_cursor_200(
+    container: Container,
+    async_client: AsyncClient,
+    class_service_mock: ClassService,
+    cursor: str,
+    limit: int,
+):
+    # Setup
+    # Request
+    params = {
+        "cursor": cursor,
+        "limit": limit,
+    }
+    # Respository
+    class_dto = ClassDTO(
+        class_id="class_id",
+        class_name="class_name",
+        teacher_id="teacher_id",
+        created_at=datetime.now(),
+    )
+    page_dto = PageDTO(
+        page=None,
+        limit=limit,
+        total=11,
+        next_cursor="next_cursor",
+    )
+    class_list_dto = ClassListDTO(
+        page=page_dto,
+        data=[class_dto],
+    )
+    class_service_mock.class_repository.read_class_list.return_value = class_list_dto
+    container.class_service.override(class_service_mock)
+
+    # Run
+    headers = {"x-api-key": "test-api-key"}
+    url = "/v1/class/list"
+    response = await async_client.get(url, headers=headers, params=params)
+    json_response = response.json()
+
+    # Assert
+    assert response.status_code == 200
+
+    page = json_response["data"]["page"]
+    assert page["page"] is None
+    assert page["nextCursor"] == page_dto.next_cursor
+
+    class_service_mock.class_repository.read_class_list.assert_called_once_with(
+        page=1,
+        limit=limit,
+        cursor=cursor,
+        with_total=True,
+        teacher_id=None,
+        name_prefix=None,
+    )
+
+
+@pytest.mark.parametrize(
+    "teacher_id,name_prefix",
+    [
+        ("teacher_id", None),
+        (None, "Math"),
+        ("teacher_id", "Math"),
+    ],
+)
+async def test_read_class_list_filtered_200(
+    container: Container,
+    async_client: AsyncClient,
+    class_service_mock: ClassService,
+    teacher_id: str,
+    name_prefix: str,
+):
+    # Setup
+    # Request
+    params = {
+        key: value
+        for key, value in {"teacherId": teacher_id, "namePrefix": name_prefix}.items()
+        if value is not None
+    }
+    # Respository
+    class_service_mock.class_repository.read_class_list.return_value = ClassListDTO(
+        page=PageDTO(page=1, limit=10, total=0),
+        data=[],
+    )
+    container.class_service.override(class_service_mock)
+
+    # Run
+    headers = {"x-api-key": "test-api-key"}
+    url = "/v1/class/list"
+    response = await async_client.get(url, headers=headers, params=params)
+
+    # Assert
+    assert response.status_code == 200
+    class_service_mock.class_repository.read_class_list.assert_called_once_with(
+        page=1,
+        limit=10,
+        cursor=None,
+        with_total=True,
+        teacher_id=teacher_id,
+        name_prefix=name_prefix,
+    )
+
+
+@pytest.mark.parametrize(
+    "cursor,expected_error",
+    [
+        ("not-a-cursor", error.ERROR_400_INVALID_CURSOR),
+        (encode_cursor("2024-01-01T00:00:00", 1), error.ERROR_400_INVALID_CURSOR),
+        (encode_cursor("2024-01-01T00:00:00", None), error.ERROR_400_INVALID_CURSOR),
+        (encode_cursor(True, "class_id"), error.ERROR_400_INVALID_CURSOR),
+    ],
+)
+async def test_read_class_list_400(
+    async_client: AsyncClient,
+    cursor: str,
+    expected_error: str,
+):
+    # Setup
+    params = {"cursor": cursor}
+
+    # Run
+    headers = {"x-api-key": "test-api-key"}
+    url = "/v1/class/list"
+    response = await async_client.get(url, headers=headers, params=params)
+    json_response = response.json()
+
+    # Assert
+    assert response.status_code == 400
+    assert json_response["statusCode"] == expected_error
+
+
 @pytest.mark.parametrize(
     "class_id,class_name,teacher_id",
     [
@@ -260,6 +473,71 @@ async def test_create_class_notice_200(
     assert json_response["data"]["message"] == class_notice_dto.message
 
 
+@pytest.mark.parametrize(
+    "request_body",
+    [
+        {"message": "message", "classIds": ["class_a", "class_b"]},
+        {"message": "message", "teacherId": "teacher_id"},
+    ],
+)
+async def test_broadcast_class_notice_200(
+    container: Container,
+    async_client: AsyncClient,
+    class_service_mock: ClassService,
+    request_body: dict,
+):
+    # Setup
+    # Respository
+    class_service_mock.class_repository.create_class_notices.return_value = [
+        ClassNoticeDTO(
+            notice_id=notice_id,
+            class_id=class_id,
+            message="message",
+            created_at=datetime.now(),
+        )
+        for notice_id, class_id in enumerate(["class_a", "class_b"], 1)
+    ]
+    container.class_service.override(class_service_mock)
+
+    # Run
+    headers = {"x-api-key": "test-api-key"}
+    url = "/v1/class/notice/broadcast"
+    response = await async_client.post(url, headers=headers, json=request_body)
+    json_response = response.json()
+
+    # Assert
+    assert response.status_code == 200
+    assert json_response["data"]["count"] == 2
+    assert json_response["data"]["data"][1]["classId"] == "class_b"
+
+    class_service_mock.class_repository.create_class_notices.assert_called_once_with(
+        message="message",
+        class_ids=request_body.get("classIds"),
+        teacher_id=request_body.get("teacherId"),
+    )
+
+
+@pytest.mark.parametrize(
+    "request_body",
+    [
+        {"message": "message"},
+        {"message": "message", "classIds": ["class_a"], "teacherId": "teacher_id"},
+        {"message": "message", "classIds": []},
+    ],
+)
+async def test_broadcast_class_notice_422(
+    async_client: AsyncClient,
+    request_body: dict,
+):
+    # Run
+    headers = {"x-api-key": "test-api-key"}
+    url = "/v1/class/notice/broadcast"
+    response = await async_client.post(url, headers=headers, json=request_body)
+
+    # Assert
+    assert response.status_code == 422
+
+
 @pytest.mark.parametrize(
     "class_id,page,limit",
     [
@@ -323,6 +601,126 @@ async def test_read_class_notice_list_200(
     assert result["message"] == class_notice_dto.message
 
 
+@pytest.mark.parametrize(
+    "class_id,limit",
+    [
+        ("class_id", 10),
+    ],
+)
+async def test_read_class_notice_list_without_total_200(
+    container: Container,
+    async_client: AsyncClient,
+    class_service_mock: ClassService,
+    class_id: str,
+    limit: int,
+):
+    # Setup
+    # Request
+    params = {
+        "limit": limit,
+        "withTotal": "false",
+    }
+    # Respository
+    page_dto = PageDTO(
+        page=1,
+        limit=limit,
+        total=None,
+    )
+    class_notice_list_dto = ClassNoticeListDTO(
+        page=page_dto,
+        data=[],
+    )
+    class_service_mock.class_repository.read_class_notice_list.return_value = (
+        class_notice_list_dto
+    )
+    container.class_service.override(class_service_mock)
+
+    # Run
+    headers = {"x-api-key": "test-api-key"}
+    url = f"/v1/class/notice/{class_id}/list"
+    response = await async_client.get(url, headers=headers, params=params)
+    json_response = response.json()
+
+    # Assert
+    assert response.status_code == 200
+    assert json_response["data"]["page"]["total"] is None
+
+    class_service_mock.class_repository.read_class_notice_list.assert_called_once_with(
+        class_id=class_id, page=1, limit=limit, cursor=None, with_total=False
+    )
+
+
+@pytest.mark.parametrize(
+    "params,expected",
+    [
+        ({"q": "homework"}, dict(q="homework", limit=10, class_id=None, cursor=None)),
+        (
+            {"q": " due  friday ", "classId": "class_id", "limit": 5},
+            dict(q="due friday", limit=5, class_id="class_id", cursor=None),
+        ),
+    ],
+)
+async def test_search_class_notices_200(
+    container: Container,
+    async_client: AsyncClient,
+    class_service_mock: ClassService,
+    params: dict,
+    expected: dict,
+):
+    # Setup
+    # Respository
+    class_notice_list_dto = ClassNoticeListDTO(
+        page=PageDTO(page=None, limit=expected["limit"], total=None, next_cursor="c"),
+        data=[
+            ClassNoticeDTO(
+                class_id="class_id",
+                notice_id=1,
+                message="homework",
+                created_at=datetime.now(),
+            )
+        ],
+    )
+    class_service_mock.class_repository.search_class_notices.return_value = (
+        class_notice_list_dto
+    )
+    container.class_service.override(class_service_mock)
+
+    # Run
+    headers = {"x-api-key": "test-api-key"}
+    url = "/v1/class/notice/search"
+    response = await async_client.get(url, headers=headers, params=params)
+    json_response = response.json()
+
+    # Assert
+    assert response.status_code == 200
+    assert json_response["data"]["data"][0]["message"] == "homework"
+    assert json_response["data"]["page"]["nextCursor"] == "c"
+
+    class_service_mock.class_repository.search_class_notices.assert_called_once_with(
+        **expected
+    )
+
+
+@pytest.mark.parametrize("q", ["", "a" * 256])
+async def test_search_class_notices_422(
+    container: Container,
+    async_client: AsyncClient,
+    class_service_mock: ClassService,
+    q: str,
+):
+    # Setup
+    container.class_service.override(class_service_mock)
+
+    # Run
+    headers = {"x-api-key": "test-api-key"}
+    url = "/v1/class/notice/search"
+    response = await async_client.get(url, headers=headers, params={"q": q})
+
+    # Assert
+    assert response.status_code == 422
+    class_service_mock.class_repository.search_class_notices.assert_not_called()
+
+
 @pytest.mark.parametrize(
     "class_id,notice_id",
     [
@@ -497,3 +895,213 @@ async def test_delete_class_notice_400(
     # Assert
     assert response.status_code == 400
     assert json_response["statusCode"] == expected_error
+
+
+async def test_enroll_students_200(
+    container: Container,
+    async_client: AsyncClient,
+    class_service_mock: ClassService,
+):
+    # Setup
+    class_service_mock.class_repository.read_class.return_value = ClassDTO(
+        class_id="class_id", class_name="class_name", teacher_id="teacher_id"
+    )
+    class_service_mock.class_repository.enroll_students.return_value = ClassEnrollDTO(
+        enrolled=["student_a"],
+        already_enrolled=["student_b"],
+        not_found=["student_c"],
+    )
+    container.class_service.override(class_service_mock)
+
+    # Run
+    headers = {"x-api-key": "test-api-key"}
+    url = "/v1/class/class_id/students"
+    response = await async_client.post(
+        url,
+        headers=headers,
+        json={"studentIds": ["student_a", "student_b", "student_c"]},
+    )
+    json_response = response.json()
+
+    # Assert
+    assert response.status_code == 200
+    assert json_response["data"]["enrolled"] == ["student_a"]
+    assert json_response["data"]["alreadyEnrolled"] == ["student_b"]
+    assert json_response["data"]["notFound"] == ["student_c"]
+
+
+async def test_enroll_students_400(
+    container: Container,
+    async_client: AsyncClient,
+    class_service_mock: ClassService,
+):
+    # Setup
+    class_service_mock.class_repository.read_class.return_value = None
+    container.class_service.override(class_service_mock)
+
+    # Run
+    headers = {"x-api-key": "test-api-key"}
+    url = "/v1/class/class_id/students"
+    response = await async_client.post(
+        url, headers=headers, json={"studentIds": ["student_a"]}
+    )
+    json_response = response.json()
+
+    # Assert
+    assert response.status_code == 400
+    assert json_response["statusCode"] == error.ERROR_400_CLASS_NOT_FOUND
+    class_service_mock.class_repository.enroll_students.assert_not_called()
+
+
+async def test_read_class_student_list_200(
+    container: Container,
+    async_client: AsyncClient,
+    class_service_mock: ClassService,
+):
+    # Setup
+    class_service_mock.class_repository.read_class_student_list.return_value = (
+        ClassStudentListDTO(
+            data=[
+                ClassStudentDTO(
+                    class_id="class_id",
+                    student_id="student_a",
+                    student_name="student_name",
+                    created_at=datetime.now(),
+                )
+            ],
+            page=PageDTO(total=2, page=None, limit=1, next_cursor="next"),
+        )
+    )
+    container.class_service.override(class_service_mock)
+
+    # Run
+    headers = {"x-api-key": "test-api-key"}
+    url = "/v1/class/class_id/students?limit=1&cursor=cursor"
+    response = await async_client.get(url, headers=headers)
+    json_response = response.json()
+
+    # Assert
+    assert response.status_code == 200
+    assert json_response["data"]["data"][0]["studentName"] == "student_name"
+    assert json_response["data"]["page"]["nextCursor"] == "next"
+    class_service_mock.class_repository.read_class_student_list.assert_called_once_with(
+        class_id="class_id", limit=1, cursor="cursor", with_total=True
+    )
+
+
+@pytest.mark.parametrize("limit", [0, -1, 1_001])
+@pytest.mark.parametrize(
+    "url,params",
+    [
+        ("/v1/class/list", {}),
+        ("/v1/class/notice/class_id/list", {}),
+        ("/v1/class/notice/search", {"q": "homework"}),
+        ("/v1/class/class_id/students", {}),
+    ],
+)
+async def test_list_routes_reject_invalid_limit_422(
+    container: Container,
+    async_client: AsyncClient,
+    class_service_mock: ClassService,
+    url: str,
+    params: dict,
+    limit: int,
+):
+    # Setup
+    container.class_service.override(class_service_mock)
+
+    # Run
+    headers = {"x-api-key": "test-api-key"}
+    response = await async_client.get(
+        url, headers=headers, params={**params, "limit": limit}
+    )
+
+    # Assert
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["query", "limit"]
+
+
+def create_reader_session():
+    # Runs statements through the cursor hooks the engine registers, including
+    # the per-transaction statement_timeout, without a database.
+    conn = MagicMock(info={})
+
+    def exec_driver_sql(statement):
+        on_before_cursor_execute(conn, None, statement)
+        on_after_cursor_execute(conn)
+
+    conn.exec_driver_sql.side_effect = exec_driver_sql
+
+    session = MagicMock()
+    session.__aenter__ = AsyncMock(return_value=session)
+    session.__aexit__ = AsyncMock(return_value=None)
+
+    async def execute(stmt):
+        on_begin(session, None, conn)
+        conn.exec_driver_sql(str(stmt))
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = []
+        return result
+
+    session.execute = AsyncMock(side_effect=execute)
+    return session
+
+
+def create_redis_cache():
+    entries = {}
+
+    async def set_(key, value, ttl, **kwargs):
+        entries[key] = CacheEntry(value=value, fresh_until=time.time() + ttl)
+        return 0
+
+    cache = MagicMock(namespace="test")
+    cache.get_entry = AsyncMock(side_effect=lambda key, type_=None: entries.get(key))
+    cache.acquire_lock = AsyncMock(return_value=MagicMock())
+    cache.release_lock = AsyncMock()
+    cache.tag_versions = AsyncMock(return_value=[None])
+    cache.set = AsyncMock(side_effect=set_)
+    return cache
+
+
+async def test_read_class_notice_list_query_budget(
+    async_client: AsyncClient,
+    query_budget,
+):
+    # Setup
+    headers = {"x-api-key": "test-api-key"}
+    url = "/v1/class/notice/class_id/list"
+    params = {"withTotal": "false"}
+
+    with patch(
+        "app.repositories.class_repository.AsyncScopedReaderSession",
+        side_effect=create_reader_session,
+    ), patch("app.core.redis.redis_cache", create_redis_cache()):
+        # Run / Assert
+        with query_budget(statements=1):
+            cold = await async_client.get(url, headers=headers, params=params)
+
+        with query_budget(statements=0):
+            warm = await async_client.get(url, headers=headers, params=params)
+
+    assert cold.status_code == 200
+    assert warm.status_code == 200
+    assert warm.json() == cold.json()
+
+
+async def test_read_class_notice_list_wrong_type_cursor_400(async_client: AsyncClient):
+    # Setup
+    params = {"cursor": encode_cursor("2024-01-01T00:00:00", "abc")}
+
+    # Run
+    headers = {"x-api-key": "test-api-key"}
+    url = "/v1/class/notice/class_id/list"
+    with patch(
+        "app.repositories.class_repository.AsyncScopedReaderSession",
+        side_effect=create_reader_session,
+    ), patch("app.core.redis.redis_cache", create_redis_cache()):
+        response = await async_client.get(url, headers=headers, params=params)
+    json_response = response.json()
+
+    # Assert
+    assert response.status_code == 400
+    assert json_response["statusCode"] == error.ERROR_400_INVALID_CURSOR
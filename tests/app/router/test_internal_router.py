@@ -0,0 +1,42 @@
+from httpx import AsyncClient
+
+from app.core.config import config
+from app.core.metrics import cache_metrics
+
+
+async def test_read_cache_metrics_200(
+    async_client: AsyncClient,
+):
+    # Setup
+    stats = cache_metrics.function("ClassRepository.read_class")
+    stats.hits += 1
+    stats.redis_latency_ms.observe(0.8)
+
+    # Run
+    headers = {"x-api-key": "test-api-key"}
+    url = "/v1/internal/cache/metrics"
+    response = await async_client.get(url, headers=headers)
+    json_response = response.json()
+
+    # Assert
+    assert response.status_code == 200
+
+    functions = json_response["data"]["functions"]
+    assert functions["ClassRepository.read_class"]["hits"] >= 1
+    assert functions["ClassRepository.read_class"]["redisLatencyMs"]["count"] >= 1
+    assert "state" in json_response["data"]["circuitBreaker"]
+
+
+async def test_read_db_pool_stats_200(
+    async_client: AsyncClient,
+):
+    # Run
+    headers = {"x-api-key": "test-api-key"}
+    url = "/v1/internal/db/pool"
+    response = await async_client.get(url, headers=headers)
+    json_response = response.json()
+
+    # Assert
+    assert response.status_code == 200
+    assert json_response["data"]["writer"]["size"] == config.DB_POOL_SIZE
+    assert "waitMs" in json_response["data"]["writer"]
@@ -151,3 +151,59 @@ async def test_create_user_student_400(
     # Assert
     assert response.status_code == 400
     assert json_response["statusCode"] == expected_error
+
+
+@pytest.mark.parametrize(
+    "content_type,body",
+    [
+        ("text/csv", b"userId,userName\nid_1,kim\nid_2,\nid_1,lee\n"),
+        (
+            "application/x-ndjson",
+            b'{"userId": "id_1", "userName": "kim"}\n'
+            b'{"userId": "id_2", "userName": ""}\n'
+            b'{"userId": "id_1", "userName": "lee"}\n',
+        ),
+    ],
+)
+async def test_import_users_200(
+    container: Container,
+    async_client: AsyncClient,
+    user_service_mock: UserService,
+    content_type: str,
+    body: bytes,
+):
+    # Setup
+    user_service_mock.user_repository.copy_users.return_value = {"id_1"}
+    container.user_service.override(user_service_mock)
+
+    # Run
+    headers = {"x-api-key": "test-api-key", "content-type": content_type}
+    url = "/v1/user/student/import"
+    response = await async_client.post(url, headers=headers, content=body)
+    json_response = response.json()
+
+    # Assert
+    assert response.status_code == 200
+    assert json_response["data"]["imported"] == 1
+    assert json_response["data"]["rejected"] == 2
+    assert [row["reason"] for row in json_response["data"]["rejectedRows"]][1] == (
+        "Duplicate user ID"
+    )
+
+    users = user_service_mock.user_repository.copy_users.call_args.kwargs["users"]
+    assert [user.user_name for user in users] == ["kim", "lee"]
+    assert users[0].user_role == UserRole.STUDENT
+
+
+async def test_import_users_400(
+    async_client: AsyncClient,
+):
+    # Run
+    headers = {"x-api-key": "test-api-key", "content-type": "application/json"}
+    url = "/v1/user/teacher/import"
+    response = await async_client.post(url, headers=headers, content=b"[]")
+    json_response = response.json()
+
+    # Assert
+    assert response.status_code == 400
+    assert json_response["statusCode"] == error.ERROR_400_INVALID_IMPORT_FILE
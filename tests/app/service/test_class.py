@@ -2,7 +2,7 @@ import pytest
 from unittest.mock import AsyncMock
 
 
-from app.models.dtos.class_ import ClassDTO
+from app.models.dtos.class_ import ClassBulkItemDTO, ClassDTO
 from app.services.class_service import ClassService
 
 
@@ -36,6 +36,33 @@ async def test_create_class(
     )
 
 
+@pytest.mark.asyncio
+async def test_create_classes(
+    class_repository_mock: AsyncMock,
+    class_service_mock: ClassService,
+):
+    # Setup
+    class_dtos = [
+        ClassDTO(class_id="class_a", class_name="a", teacher_id="teacher_id"),
+        ClassDTO(class_id="class_b", class_name="b", teacher_id="teacher_id"),
+    ]
+    class_repository_mock.create_classes.return_value = [
+        ClassBulkItemDTO(index=index, data=class_dto)
+        for index, class_dto in enumerate(class_dtos)
+    ]
+    class_service_mock.class_repository = class_repository_mock
+
+    # Run
+    results = await class_service_mock.create_classes(class_dtos=class_dtos)
+
+    # Assert
+    assert [result.data for result in results] == class_dtos
+
+    class_service_mock.class_repository.create_classes.assert_called_once_with(
+        classes=class_dtos
+    )
+
+
 @pytest.mark.asyncio
 async def test_read_class_list(
     class_repository_mock: AsyncMock,
@@ -64,7 +91,12 @@ async def test_read_class_list(
     assert result.teacher_id == class_dto.teacher_id
 
     class_service_mock.class_repository.read_class_list.assert_called_once_with(
-        page=page, limit=limit
+        page=page,
+        limit=limit,
+        cursor=None,
+        with_total=True,
+        teacher_id=None,
+        name_prefix=None,
     )
 
 
@@ -2,7 +2,7 @@ import pytest
 from unittest.mock import AsyncMock
 
 
-from app.models.dtos.class_ import ClassNoticeDTO
+from app.models.dtos.class_ import ClassNoticeBroadcastDTO, ClassNoticeDTO
 from app.services.class_service import ClassService
 
 
@@ -36,6 +36,34 @@ async def test_create_class_notice(
     )
 
 
+@pytest.mark.asyncio
+async def test_broadcast_class_notice(
+    class_repository_mock: AsyncMock,
+    class_service_mock: ClassService,
+):
+    # Setup
+    broadcast_dto = ClassNoticeBroadcastDTO(
+        message="message", class_ids=["class_a", "class_b"]
+    )
+    class_repository_mock.create_class_notices.return_value = [
+        ClassNoticeDTO(notice_id=1, class_id="class_a", message="message"),
+        ClassNoticeDTO(notice_id=2, class_id="class_b", message="message"),
+    ]
+    class_service_mock.class_repository = class_repository_mock
+
+    # Run
+    results = await class_service_mock.broadcast_class_notice(
+        broadcast_dto=broadcast_dto
+    )
+
+    # Assert
+    assert [result.class_id for result in results] == ["class_a", "class_b"]
+
+    class_service_mock.class_repository.create_class_notices.assert_called_once_with(
+        message="message", class_ids=["class_a", "class_b"], teacher_id=None
+    )
+
+
 @pytest.mark.asyncio
 async def test_read_class_notice_list(
     class_repository_mock: AsyncMock,
@@ -67,7 +95,7 @@ async def test_read_class_notice_list(
     assert result.message == class_notice_dto.message
 
     class_service_mock.class_repository.read_class_notice_list.assert_called_once_with(
-        class_id=class_id, page=page, limit=limit
+        class_id=class_id, page=page, limit=limit, cursor=None, with_total=True
     )
 
 
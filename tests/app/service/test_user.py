@@ -1,7 +1,8 @@
 import pytest
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, patch
 
 
+from app.core.errors import error
 from app.models.dtos.user import UserDTO
 from app.models.constant import UserRole
 from app.services.user_service import UserService
@@ -65,3 +66,31 @@ async def test_create_student(
         user_name=user_dto.user_name,
         user_role=user_dto.user_role,
     )
+
+
+@pytest.mark.asyncio
+async def test_import_users_batches_rows(
+    user_repository_mock: AsyncMock,
+    user_service_mock: UserService,
+):
+    # Setup
+    async def rows():
+        yield 1, UserDTO(user_id="id_1", user_name="a", user_role=UserRole.STUDENT)
+        yield 2, "userName: Field required"
+        yield 3, UserDTO(user_id="id_2", user_name="b", user_role=UserRole.STUDENT)
+        yield 4, UserDTO(user_id="id_3", user_name="c", user_role=UserRole.STUDENT)
+
+    user_repository_mock.copy_users.side_effect = [
+        {"id_1", "id_2"},
+        error.UserCreationFailed(),
+    ]
+
+    # Run
+    with patch("app.services.user_service.config.IMPORT_BATCH_SIZE", 2):
+        result = await user_service_mock.import_users(UserRole.STUDENT, rows())
+
+    # Assert
+    assert result.imported == 2
+    assert result.rejected == 2
+    assert [row.line for row in result.rejected_rows] == [2, 4]
+    assert user_repository_mock.copy_users.call_count == 2